@@ -7,7 +7,6 @@ import sys
 import threading
 import requests
 import webbrowser
-from datetime import datetime
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
@@ -19,8 +18,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon
 
-from database import Database
-from api import run_server
+from api import run_server, db, export_jobs
 
 
 class ServerThread(QThread):
@@ -125,8 +123,8 @@ class AdminGUI(QMainWindow):
         self.server_thread = None
         self.api_base = "http://localhost:8000"
 
-        # Datenbank
-        self.db = Database()
+        # Datenbank (dieselbe Instanz wie der API-Server, damit die Stimmen-Zähler übereinstimmen)
+        self.db = db
 
         # Kandidaten-Daten Cache
         self.candidates_data = []
@@ -138,6 +136,11 @@ class AdminGUI(QMainWindow):
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.refresh_results)
 
+        # Timer für den laufenden Export-Job (fragt den Fortschritt ab, statt zu blockieren)
+        self.export_job_id = None
+        self.export_timer = QTimer()
+        self.export_timer.timeout.connect(self.poll_export_job)
+
         # Initiales Update
         self.refresh_candidates()
         self.refresh_results()
@@ -358,10 +361,10 @@ class AdminGUI(QMainWindow):
         reset_btn.setMinimumHeight(45)
         h_layout.addWidget(reset_btn)
 
-        export_btn = QPushButton("📄 Excel exportieren")
-        export_btn.clicked.connect(self.export_excel)
-        export_btn.setMinimumHeight(45)
-        h_layout.addWidget(export_btn)
+        self.export_btn = QPushButton("📄 Excel exportieren")
+        self.export_btn.clicked.connect(self.export_excel)
+        self.export_btn.setMinimumHeight(45)
+        h_layout.addWidget(self.export_btn)
 
         title_btn = QPushButton("✏ Titel ändern")
         title_btn.clicked.connect(self.change_title)
@@ -597,7 +600,7 @@ class AdminGUI(QMainWindow):
             self, "Datenbank zurücksetzen",
             "WARNUNG: Die gesamte Datenbank wird gelöscht und neu erstellt!\n\n"
             "- Alle Kandidaten werden gelöscht\n"
-            "- Alle Stimmen werden gelöscht\n"
+            "- Alle Stimmen werden archiviert (Export über /api/elections bleibt möglich)\n"
             "- Alle Client-Informationen werden gelöscht\n"
             "- Alle Einstellungen werden zurückgesetzt\n\n"
             "Möchten Sie wirklich fortfahren?",
@@ -605,21 +608,8 @@ class AdminGUI(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Lösche und erstelle alle Tabellen neu
-            conn = self.db._get_connection()
-            cursor = conn.cursor()
-
-            # Lösche alle Tabellen
-            cursor.execute("DROP TABLE IF EXISTS votes")
-            cursor.execute("DROP TABLE IF EXISTS candidates")
-            cursor.execute("DROP TABLE IF EXISTS clients")
-            cursor.execute("DROP TABLE IF EXISTS settings")
-
-            conn.commit()
-            conn.close()
-
-            # Erstelle Tabellen neu
-            self.db._init_database()
+            # Setzt alles zurück; die bisherige Wahl wird im Hintergrund archiviert
+            self.db.reset_database()
 
             self.refresh_candidates()
             self.refresh_results()
@@ -643,19 +633,15 @@ class AdminGUI(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.db.unlock_clients()
-
-            # Sende Unlock-Broadcast über WebSocket (löst Client-Reload aus)
+            # Der Server startet die neue Runde und sendet den Unlock-Broadcast (löst Client-Reload aus)
             try:
-                import asyncio
-                from websocket_manager import WebSocketManager
-
-                # Hole die WebSocket-Manager-Instanz aus der API
-                # Dies wird über den bereits laufenden Server kommuniziert
-                requests.post(f"{self.api_base}/api/admin/unlock", timeout=2)
-
+                response = requests.post(f"{self.api_base}/api/admin/unlock", timeout=2)
+                if response.status_code != 200:
+                    raise Exception("Clients konnten nicht entsperrt werden")
             except Exception as e:
-                print(f"WebSocket-Broadcast-Fehler: {e}")
+                QMessageBox.critical(self, "Fehler",
+                                   f"Entsperren fehlgeschlagen:\n{str(e)}\n\nServer muss laufen!")
+                return
 
             QMessageBox.information(self, "Erfolg", "Alle Clients wurden entsperrt und neu geladen")
 
@@ -673,37 +659,81 @@ class AdminGUI(QMainWindow):
             QMessageBox.information(self, "Erfolg", "Alle Stimmen wurden zurückgesetzt")
 
     def export_excel(self):
-        """Exportiert als Excel"""
+        """Startet den Excel-Export als Job auf dem Server"""
         try:
-            response = requests.get(f"{self.api_base}/api/export", timeout=10)
-            if response.status_code == 200:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"abstimmung_ergebnisse_{timestamp}.xlsx"
-                
-                # Open file save dialog
-                from PyQt6.QtWidgets import QFileDialog
-                filepath, _ = QFileDialog.getSaveFileName(
-                    self,
-                    "Excel-Datei speichern",  # Dialog title
-                    str(Path.home() / "Downloads" / filename),  # Default path and filename
-                    "Excel Files (*.xlsx);;All Files (*)"  # File filters
-                )
-                
-                # Check if user cancelled the dialog
-                if not filepath:
-                    return
-                
-                # Ensure .xlsx extension
-                if not filepath.endswith('.xlsx'):
-                    filepath += '.xlsx'
+            response = requests.post(f"{self.api_base}/api/export/jobs", timeout=2)
+            if response.status_code != 202:
+                raise Exception("Export konnte nicht gestartet werden")
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler",
+                               f"Excel-Export fehlgeschlagen:\n{str(e)}\n\nServer muss laufen!")
+            return
+
+        self.export_job_id = response.json()["job_id"]
+        self.export_btn.setEnabled(False)
+        self.export_btn.setText("📄 Export läuft...")
+        self.export_timer.start(500)
+
+    def poll_export_job(self):
+        """Fragt den Status des Export-Jobs ab und speichert die Datei, sobald sie fertig ist"""
+        try:
+            response = requests.get(f"{self.api_base}/api/export/jobs/{self.export_job_id}", timeout=2)
+            if response.status_code != 200:
+                raise Exception("Export-Job nicht gefunden")
+            job = response.json()
+
+            if job["status"] in ("queued", "running"):
+                if job["total_rows"]:
+                    percent = job["rows_written"] / job["total_rows"] * 100
+                    self.export_btn.setText(f"📄 Export läuft... {percent:.0f}%")
+                return
+            if job["status"] != "done":
+                raise Exception(job["error"] or f"Export-Job {job['status']}")
+        except Exception as e:
+            self.finish_export()
+            QMessageBox.critical(self, "Fehler",
+                               f"Excel-Export fehlgeschlagen:\n{str(e)}\n\nServer muss laufen!")
+            return
+
+        self.finish_export()
+        self.save_export(job)
+
+    def finish_export(self):
+        """Beendet das Abfragen des Export-Jobs"""
+        self.export_timer.stop()
+        self.export_btn.setEnabled(True)
+        self.export_btn.setText("📄 Excel exportieren")
+
+    def save_export(self, job):
+        """Lädt die fertige Datei eines Export-Jobs herunter"""
+        try:
+            # Open file save dialog
+            from PyQt6.QtWidgets import QFileDialog
+            filepath, _ = QFileDialog.getSaveFileName(
+                self,
+                "Excel-Datei speichern",  # Dialog title
+                str(Path.home() / "Downloads" / job["filename"]),  # Default path and filename
+                "Excel Files (*.xlsx);;All Files (*)"  # File filters
+            )
+
+            # Check if user cancelled the dialog
+            if not filepath:
+                return
+
+            # Ensure .xlsx extension
+            if not filepath.endswith('.xlsx'):
+                filepath += '.xlsx'
 
+            with requests.get(f"{self.api_base}/api/export/jobs/{job['job_id']}/download",
+                              stream=True, timeout=10) as response:
+                if response.status_code != 200:
+                    raise Exception(response.json().get("detail", "Download fehlgeschlagen"))
                 with open(filepath, "wb") as f:
-                    f.write(response.content)
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
 
-                QMessageBox.information(self, "Export erfolgreich",
-                                       f"Datei gespeichert:\n{filepath}")
-            else:
-                raise Exception("Export fehlgeschlagen")
+            QMessageBox.information(self, "Export erfolgreich",
+                                   f"Datei gespeichert:\n{filepath}")
         except Exception as e:
             QMessageBox.critical(self, "Fehler",
                                f"Excel-Export fehlgeschlagen:\n{str(e)}\n\nServer muss laufen!")
@@ -745,6 +775,10 @@ class AdminGUI(QMainWindow):
     def closeEvent(self, event):
         """Handler für Fenster-Schließen"""
         self.update_timer.stop()
+        self.export_timer.stop()
+        # Der Server läuft im QThread, sein Lifespan-Shutdown wird nie ausgeführt
+        export_jobs.close()
+        self.db.close()
         event.accept()
 
 
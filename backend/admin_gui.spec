@@ -17,6 +17,18 @@ a = Analysis(
         ('api.py', '.'),
         ('models.py', '.'),
         ('websocket_manager.py', '.'),
+        ('vote_writer.py', '.'),
+        ('migrations.py', '.'),
+        ('rwlock.py', '.'),
+        ('async_database.py', '.'),
+        ('election_archive.py', '.'),
+        ('excel_export.py', '.'),
+        ('export_jobs.py', '.'),
+        ('rate_limit.py', '.'),
+        ('admission.py', '.'),
+        ('metrics.py', '.'),
+        ('profiling.py', '.'),
+        ('results_publisher.py', '.'),
         ('requirements.txt', '.'),
         # Include static directory if it exists
         ('static', 'static') if (current_dir / 'static').exists() else None,
@@ -26,6 +38,18 @@ a = Analysis(
         'api', 
         'models',
         'websocket_manager',
+        'vote_writer',
+        'migrations',
+        'rwlock',
+        'async_database',
+        'election_archive',
+        'excel_export',
+        'export_jobs',
+        'rate_limit',
+        'admission',
+        'metrics',
+        'profiling',
+        'results_publisher',
         
         'fastapi',
         'fastapi.middleware',
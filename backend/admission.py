@@ -0,0 +1,117 @@
+"""
+Warteraum für Lastspitzen bei der Stimmabgabe
+Höchstens `max_concurrent` Anfragen werden gleichzeitig bearbeitet, bis zu
+`max_queue` weitere warten der Reihe nach (FIFO). Ist die Warteschlange voll
+oder wartet eine Anfrage länger als `max_wait`, wird sie sofort abgewiesen,
+statt sich am Datenbank-Lock bis zum Client-Timeout zu stauen.
+Wird nur aus dem Event-Loop aufgerufen und braucht daher keinen Lock.
+"""
+
+from collections import deque
+from typing import Deque, Dict
+import asyncio
+import time
+
+from metrics import Histogram
+
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    "easywahl_vote_admission_wait_seconds", "Wartezeit zugelassener Stimmabgaben im Warteraum"
+)
+
+
+class AdmissionQueue:
+    def __init__(self, max_concurrent: int = 32, max_queue: int = 256, max_wait: float = 5.0):
+        """
+        max_concurrent: gleichzeitig bearbeitete Anfragen
+        max_queue: maximale Anzahl wartender Anfragen
+        max_wait: maximale Wartezeit (s) in der Warteschlange
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Metriken
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.max_queued = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    async def acquire(self) -> bool:
+        """
+        Wartet auf einen freien Platz
+        Returns: True wenn zugelassen (danach release() aufrufen), False wenn abgewiesen
+        """
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            ADMISSION_WAIT_SECONDS.observe(0.0)
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queued = max(self.max_queued, len(self._waiters))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            # Wurde der Platz genau jetzt zugeteilt, gilt die Anfrage als zugelassen
+            if not waiter.done():
+                self._remove_waiter(waiter)
+                self.rejected_timeout += 1
+                return False
+        except asyncio.CancelledError:
+            # Client hat aufgegeben: Warteplatz bzw. schon zugeteilten Platz freigeben
+            if waiter.done():
+                self.release()
+            else:
+                self._remove_waiter(waiter)
+            raise
+
+        wait = time.perf_counter() - start
+        self.total_wait += wait
+        self.max_wait_seen = max(self.max_wait_seen, wait)
+        self.admitted += 1
+        ADMISSION_WAIT_SECONDS.observe(wait)
+        return True
+
+    def release(self):
+        """Gibt einen Platz frei und lässt die nächste wartende Anfrage herein"""
+        self._active -= 1
+        self._wake_next()
+
+    def _remove_waiter(self, waiter: asyncio.Future):
+        waiter.cancel()
+        self._waiters.remove(waiter)
+
+    def _wake_next(self):
+        # Der Platz geht direkt an den Wartenden über (kein Überholen durch Neuankömmlinge)
+        while self._waiters and self._active < self.max_concurrent:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+    def get_stats(self) -> Dict:
+        """Gibt Auslastung, Warteschlange und Wartezeiten zurück"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_ms": self.total_wait / self.admitted * 1000 if self.admitted else 0.0,
+            "max_wait_ms": self.max_wait_seen * 1000,
+        }
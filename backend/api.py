@@ -3,34 +3,402 @@ FastAPI Server für das Poll-System
 Stellt REST-API und WebSocket-Endpoints bereit
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request, Query, Depends
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from typing import List
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import json
+import math
+import time
 import uvicorn
 from datetime import datetime
-from openpyxl import Workbook
-import os
-import tempfile
 
 from database import Database
+from async_database import AsyncDatabase
+from excel_export import stream_workbook
+from admission import AdmissionQueue
+from export_jobs import ExportJobManager
+import metrics
+from profiling import ProcessSampler, RequestProfiler, SlowRequestLog
+from rate_limit import TokenBucketLimiter
+from results_publisher import ResultsPublisher
 from models import (
     Candidate, CandidateCreate, CandidateUpdate,
     VoteRequest, VoteResponse, VoteCheckRequest, VoteCheckResponse,
     VoteResult, ResultsSummary, ResetResponse, UnlockResponse,
-    ServerStatus
+    ServerStatus, RoundInfo, ElectionInfo, ExportJob
 )
 from websocket_manager import WebSocketManager
 
 
+# === METRIKEN ===
+
+HTTP_SECONDS = metrics.Histogram(
+    "easywahl_http_request_duration_seconds", "Dauer bis zum letzten Antwort-Byte pro Route",
+    labels=("method", "route")
+)
+HTTP_RESPONSES = metrics.Counter(
+    "easywahl_http_responses_total", "Antworten pro Route und Statuscode", labels=("method", "route", "status")
+)
+VOTES = metrics.Counter(
+    "easywahl_votes_total",
+    "Stimmabgaben nach Ergebnis (accepted, rejected, rate_limited, overloaded)",
+    labels=("result",)
+)
+
+
+class MetricsMiddleware:
+    """
+    Misst Dauer und Statuscode jeder HTTP-Anfrage (äußerste Middleware, zählt auch Fast-Path-Antworten)
+    Label ist das Routen-Template (z.B. /api/candidates/{candidate_id}), damit die Zahl der Zeitreihen begrenzt bleibt
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        finished = None
+
+        async def send_and_measure(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                path = route.path
+            elif scope["path"] in CACHED_PATHS or scope["path"] in RATE_LIMITS or scope["path"] in ADMISSION_PATHS:
+                # Von einer Middleware beantwortet, bevor das Routing lief
+                path = scope["path"]
+            else:
+                path = "unmatched"
+            HTTP_SECONDS.labels(scope["method"], path).observe((finished or time.perf_counter()) - start)
+            HTTP_RESPONSES.labels(scope["method"], path, status).inc()
+
+
+# === PROFILING ===
+
+request_profiler = RequestProfiler()
+process_sampler = ProcessSampler()
+slow_request_log = SlowRequestLog()
+
+
+class ProfilingMiddleware:
+    """
+    Profiliert stichprobenartig Anfragen (cProfile) und protokolliert langsame Anfragen
+    Ohne aktives Profiling nur eine Abfrage pro Anfrage
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (request_profiler.active or slow_request_log.active):
+            await self.app(scope, receive, send)
+            return
+
+        # Datenbank-Aufrufe nur verfolgen, wenn das Slow-Request-Log an ist (nicht bei reinem Profiling)
+        token = slow_request_log.begin() if slow_request_log.active else None
+        start = time.perf_counter()
+        status = 500
+        finished = None
+
+        async def send_and_measure(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()
+
+        # Jede Anfrage beendet die Aufzeichnung, die sie gestartet hat (auch nach einem Neustart)
+        profile = request_profiler.enable() if request_profiler.should_profile() else None
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            if profile is not None:
+                request_profiler.disable(profile)
+            if token is not None:
+                duration = (finished or time.perf_counter()) - start
+                slow_request_log.end(token, scope["method"], scope["path"], status, duration)
+
+
+def _collect_component_stats():
+    """Statistiken der einzelnen Komponenten als Metriken (werden erst beim Abruf berechnet)"""
+    components = [
+        ("vote_writer", "Group-Commit-Writer", [({}, db.vote_writer.get_stats())] if db.vote_writer else []),
+        ("response_cache", "Response-Cache", [({}, response_cache.get_stats())]),
+        ("export_jobs", "Export-Jobs", [({}, export_jobs.get_stats())]),
+        ("rate_limit", "Rate-Limit", [({"route": path}, limiter.get_stats()) for path, limiter in RATE_LIMITS.items()]),
+        ("vote_admission", "Warteraum", [({}, vote_admission.get_stats())]),
+        ("websocket", "WebSocket-Verbindungen", [({}, ws_manager.get_stats())]),
+        ("results_publisher", "Ergebnis-Updates", [({}, results_publisher.get_stats())]),
+    ]
+    for component, description, entries in components:
+        for key in (entries[0][1] if entries else ()):
+            samples = [
+                (labels, float(stats[key])) for labels, stats in entries
+                if isinstance(stats[key], (int, float))
+            ]
+            if samples:
+                yield f"easywahl_{component}_{key}", "untyped", f"{description}: {key}", samples
+
+
+# === RESPONSE-CACHE ===
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Vergleicht If-None-Match mit dem ETag (schwacher Vergleich, wie für GET vorgesehen)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Fertig serialisierte JSON-Antworten pro Endpoint, gültig für genau eine Datenversion
+    Jede Schreiboperation erhöht die Version und macht damit alle Einträge ungültig
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, key: str, version: str) -> Optional[bytes]:
+        """Wie get(), zählt aber keinen Miss (für den Fast-Path)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def get(self, key: str, version: str) -> Optional[bytes]:
+        """Gibt die gespeicherte Antwort zurück, falls sie zur aktuellen Version gehört"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, version: str, body: bytes):
+        """Speichert eine Antwort (pro Endpoint nur die neueste Version)"""
+        self._entries[key] = (version, body)
+
+    def clear(self):
+        """Verwirft alle Einträge"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Gibt Trefferquote und Größe des Caches zurück"""
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(body) for _, body in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0
+        }
+
+
+response_cache = ResponseCache()
+
+# Pfade, deren Antworten ohne Query-Parameter direkt aus dem Cache kommen
+CACHED_PATHS = {
+    "/api/results": "results:None",
+    "/api/candidates": "candidates",
+    "/api/admin/status": "status",
+    "/api/settings/vote-title": "vote_title",
+}
+
+
+def _json_bytes(data) -> bytes:
+    """Serialisiert wie FastAPIs JSONResponse"""
+    return json.dumps(
+        jsonable_encoder(data),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class CachedResponseMiddleware:
+    """
+    Fast-Path für Cache-Treffer: beantwortet GETs auf CACHED_PATHS direkt,
+    ohne Routing und Dependency-Auflösung. Bei einem Miss übernimmt der Endpoint.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET" and not scope["query_string"]:
+            key = CACHED_PATHS.get(scope["path"])
+            if key is not None:
+                version = db.get_data_version()
+                etag = f'"{version}"'
+                if_none_match = None
+                for name, value in scope["headers"]:
+                    if name == b"if-none-match":
+                        if_none_match = value.decode("latin-1")
+                        break
+
+                if _etag_matches(if_none_match, etag):
+                    status, body = 304, b""
+                else:
+                    status, body = 200, response_cache.peek(key, version)
+
+                if body is not None:
+                    headers = [
+                        (b"etag", etag.encode()),
+                        (b"cache-control", b"no-cache"),
+                    ]
+                    if status == 200:
+                        headers.append((b"content-type", b"application/json"))
+                        headers.append((b"content-length", str(len(body)).encode()))
+                    await send({"type": "http.response.start", "status": status, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+        await self.app(scope, receive, send)
+
+
+# === RATE-LIMITING ===
+
+# Limits pro Route und Client-IP (dieselbe Identität wie bei cast_vote)
+# Ein Wähler braucht wenige Anfragen; Schleifen einzelner Kiosks werden gebremst
+RATE_LIMITS = {
+    "/api/vote": TokenBucketLimiter(rate=1.0, burst=5),
+    "/api/vote/check": TokenBucketLimiter(rate=2.0, burst=10),
+}
+
+
+class RateLimitMiddleware:
+    """
+    Beantwortet Anfragen über dem Limit direkt mit 429 und Retry-After,
+    bevor Body-Parsing oder Datenbank etwas davon merken
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limiter = RATE_LIMITS.get(scope["path"])
+            if limiter is not None and scope.get("client"):
+                wait = limiter.acquire(scope["client"][0])
+                if wait > 0:
+                    if scope["path"] == "/api/vote":
+                        VOTES.labels("rate_limited").inc()
+                    body = _json_bytes({"detail": "Zu viele Anfragen, bitte kurz warten"})
+                    headers = [
+                        (b"retry-after", str(math.ceil(wait)).encode()),
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ]
+                    await send({"type": "http.response.start", "status": 429, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+        await self.app(scope, receive, send)
+
+
+# === WARTERAUM ===
+
+# Höchstens 64 Stimmen gleichzeitig in Bearbeitung (ein voller Commit-Batch), bis zu 512 warten
+vote_admission = AdmissionQueue(max_concurrent=64, max_queue=512, max_wait=5.0)
+ADMISSION_PATHS = {"/api/vote"}
+# Empfohlene Wartezeit (s) für abgewiesene Anfragen; das Frontend streut zusätzlich zufällig
+ADMISSION_RETRY_AFTER = 1
+
+
+class AdmissionMiddleware:
+    """
+    Lässt Stimmabgaben nur über den Warteraum herein; ist er voll, kommt sofort 503 mit Retry-After
+    Der Platz wird frei, sobald die Antwort gesendet ist (Hintergrund-Tasks zählen nicht mit)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in ADMISSION_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if not await vote_admission.acquire():
+            VOTES.labels("overloaded").inc()
+            body = _json_bytes({"detail": "Server ausgelastet, bitte gleich erneut versuchen"})
+            headers = [
+                (b"retry-after", str(ADMISSION_RETRY_AFTER).encode()),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            await send({"type": "http.response.start", "status": 503, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        released = False
+
+        async def send_and_release(message):
+            nonlocal released
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not released:
+                released = True
+                vote_admission.release()
+
+        try:
+            await self.app(scope, receive, send_and_release)
+        finally:
+            if not released:
+                vote_admission.release()
+
+
 # === INITIALISIERUNG ===
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Schließt beim Herunterfahren Ergebnis-Updates, Sampler, Export-Jobs, DB-Thread-Pool und Connection-Pool"""
+    yield
+    await results_publisher.close()
+    process_sampler.stop()
+    export_jobs.close()
+    async_db.close()
+
+
 app = FastAPI(
     title="easyWahl Poll API",
     description="API für lokales Abstimmungssystem",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Cache-Treffer ohne Routing beantworten (innerhalb von CORS, daher zuerst registriert)
+app.add_middleware(CachedResponseMiddleware)
+# Warteraum für Stimmabgaben (hinter dem Rate-Limit: Störer belegen keine Plätze)
+app.add_middleware(AdmissionMiddleware)
+# Rate-Limits vor dem Routing prüfen (ebenfalls innerhalb von CORS)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS aktivieren (erlaubt Frontend-Zugriff)
 app.add_middleware(
     CORSMiddleware,
@@ -38,32 +406,76 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Frontend läuft auf einem anderen Port und muss Retry-After lesen können
+    expose_headers=["Retry-After"],
 )
 
+# Profiling und Slow-Request-Log (nur aktiv, wenn über die Profiling-Endpoints eingeschaltet)
+app.add_middleware(ProfilingMiddleware)
+
+# Zuletzt registriert und damit außen: misst alle Antworten, auch CORS-Preflights und Fast-Path
+app.add_middleware(MetricsMiddleware)
+
 # Globale Instanzen
-db = Database()
+# Stimmen werden in Micro-Batches committet (max. 64 Stimmen oder 2 ms Wartezeit)
+db = Database(max_batch_size=64, max_batch_delay=0.002)
+# Awaitable Zugriff für die Endpoints (blockierende Aufrufe laufen im DB-Thread-Pool)
+async_db = AsyncDatabase(db)
 ws_manager = WebSocketManager()
+# Höchstens ein Ergebnis-Update pro Intervall (s), egal wie viele Stimmen eingehen -
+# die Charts auf /live und /results rendern ohnehin nicht schneller
+RESULTS_PUBLISH_INTERVAL = 0.25
+results_publisher = ResultsPublisher(async_db, ws_manager, interval=RESULTS_PUBLISH_INTERVAL)
+# Export-Jobs laufen in einem eigenen Worker-Pool, fertige Dateien werden wiederverwendet
+export_jobs = ExportJobManager(db)
+
+# Lock-Metriken der Server-Datenbank und Komponenten-Statistiken unter /metrics veröffentlichen
+metrics.register(db.lock.wait_seconds, db.lock.hold_seconds)
+metrics.register_collector(_collect_component_stats)
+
+
+async def _cached_json(request: Request, key: str, build: Callable[[], Awaitable]) -> Response:
+    """
+    Antwortet mit ETag aus dem Response-Cache
+    304 bei passendem If-None-Match, sonst gespeicherte Bytes; nur bei einem Miss wird build() aufgerufen
+    """
+    # Version vor dem Lesen bestimmen: die Daten sind dann höchstens neuer als der Schlüssel
+    version = db.get_data_version()
+    # no-cache: Browser speichern die Antwort, fragen aber jedes Mal mit If-None-Match nach
+    headers = {"ETag": f'"{version}"', "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(key, version)
+    if body is None:
+        body = _json_bytes(await build())
+        response_cache.put(key, version, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # === KANDIDATEN-ENDPOINTS ===
 
 @app.get("/api/candidates", response_model=List[Candidate], tags=["Kandidaten"])
-async def get_candidates():
-    """Gibt alle Kandidaten zurück"""
-    candidates = db.get_candidates()
-    return candidates
+async def get_candidates(request: Request):
+    """Gibt alle Kandidaten zurück (aus dem Response-Cache, mit ETag)"""
+    async def build():
+        candidates = await async_db.get_candidates()
+        return [Candidate(**c) for c in candidates]
+
+    return await _cached_json(request, "candidates", build)
 
 
 @app.post("/api/candidates", response_model=Candidate, tags=["Kandidaten"])
 async def create_candidate(candidate: CandidateCreate):
     """Erstellt einen neuen Kandidaten"""
-    candidate_id = db.add_candidate(candidate.name, candidate.description)
+    candidate_id = await async_db.add_candidate(candidate.name, candidate.description)
 
-    # Benachrichtige WebSocket-Clients
+    # Benachrichtige WebSocket-Clients (Ergebnisse mit dem neuen Kandidaten folgen vollständig)
     await ws_manager.broadcast_candidates_update()
+    results_publisher.mark_dirty()
 
     # Hole den erstellten Kandidaten
-    candidates = db.get_candidates()
+    candidates = await async_db.get_candidates()
     created = next((c for c in candidates if c['id'] == candidate_id), None)
 
     if not created:
@@ -75,16 +487,17 @@ async def create_candidate(candidate: CandidateCreate):
 @app.put("/api/candidates/{candidate_id}", response_model=Candidate, tags=["Kandidaten"])
 async def update_candidate(candidate_id: int, candidate: CandidateUpdate):
     """Aktualisiert einen Kandidaten"""
-    success = db.update_candidate(candidate_id, candidate.name, candidate.description)
+    success = await async_db.update_candidate(candidate_id, candidate.name, candidate.description)
 
     if not success:
         raise HTTPException(status_code=404, detail="Kandidat nicht gefunden")
 
-    # Benachrichtige WebSocket-Clients
+    # Benachrichtige WebSocket-Clients (Ergebnisse mit dem neuen Namen folgen vollständig)
     await ws_manager.broadcast_candidates_update()
+    results_publisher.mark_dirty()
 
     # Hole den aktualisierten Kandidaten
-    candidates = db.get_candidates()
+    candidates = await async_db.get_candidates()
     updated = next((c for c in candidates if c['id'] == candidate_id), None)
 
     return updated
@@ -93,7 +506,7 @@ async def update_candidate(candidate_id: int, candidate: CandidateUpdate):
 @app.delete("/api/candidates/{candidate_id}", tags=["Kandidaten"])
 async def delete_candidate(candidate_id: int):
     """Löscht einen Kandidaten und alle seine Stimmen"""
-    success = db.delete_candidate(candidate_id)
+    success = await async_db.delete_candidate(candidate_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Kandidat nicht gefunden")
@@ -102,9 +515,7 @@ async def delete_candidate(candidate_id: int):
     await ws_manager.broadcast_candidates_update()
 
     # Sende aktualisierte Ergebnisse
-    results = db.get_results()
-    total_votes = db.get_total_votes()
-    await ws_manager.broadcast_results(results, total_votes)
+    await results_publisher.publish()
 
     return {"success": True, "message": "Kandidat gelöscht"}
 
@@ -117,10 +528,13 @@ async def cast_vote(vote: VoteRequest, request: Request):
     Gibt eine Stimme ab
     Jeder Client kann nur einmal pro Runde abstimmen
     Verwendet IP-Adresse als Client-Identifier
+    Die Antwort kommt direkt nach dem Commit; die WebSocket-Clients erhalten die Stimme gebündelt
     """
     # Extrahiere IP-Adresse aus dem Request
     client_ip = request.client.host
-    success = db.cast_vote(client_ip, vote.candidate_id)
+    # Wartet auf den Commit (bzw. Batch), ohne den Event-Loop zu blockieren
+    success = await async_db.cast_vote(client_ip, vote.candidate_id)
+    VOTES.labels("accepted" if success else "rejected").inc()
 
     if not success:
         return VoteResponse(
@@ -128,17 +542,8 @@ async def cast_vote(vote: VoteRequest, request: Request):
             message="Sie haben bereits abgestimmt oder der Kandidat existiert nicht"
         )
 
-    # Hole Kandidatenname für Broadcast
-    candidates = db.get_candidates()
-    candidate = next((c for c in candidates if c['id'] == vote.candidate_id), None)
-
-    if candidate:
-        await ws_manager.broadcast_vote_cast(vote.candidate_id, candidate['name'])
-
-    # Sende aktualisierte Ergebnisse
-    results = db.get_results()
-    total_votes = db.get_total_votes()
-    await ws_manager.broadcast_results(results, total_votes)
+    # Für das nächste gebündelte Ergebnis-Update vormerken
+    results_publisher.vote_cast(vote.candidate_id)
 
     return VoteResponse(
         success=True,
@@ -151,17 +556,25 @@ async def check_vote_status(request: VoteCheckRequest, fastapi_request: Request)
     """Prüft ob ein Client bereits abgestimmt hat"""
     # Extrahiere IP-Adresse aus dem Request
     client_ip = fastapi_request.client.host
-    has_voted = db.has_voted(client_ip)
+    has_voted = await async_db.has_voted(client_ip)
     return VoteCheckResponse(has_voted=has_voted)
 
 
 # === ERGEBNIS-ENDPOINTS ===
 
 @app.get("/api/results", response_model=ResultsSummary, tags=["Ergebnisse"])
-async def get_results():
-    """Gibt die aktuellen Abstimmungsergebnisse zurück"""
-    results = db.get_results()
-    total_votes = db.get_total_votes()
+async def get_results(request: Request, round_id: Optional[int] = Query(None, alias="round", gt=0)):
+    """Gibt die aktuellen Abstimmungsergebnisse zurück (optional nur für eine Runde, aus dem Response-Cache)"""
+    return await _cached_json(request, f"results:{round_id}", lambda: _build_results(round_id))
+
+
+async def _build_results(round_id: Optional[int]) -> ResultsSummary:
+    """Liest die Ergebnisse aus der Datenbank"""
+    if round_id is not None and not await async_db.round_exists(round_id):
+        raise HTTPException(status_code=404, detail="Runde nicht gefunden")
+
+    results = await async_db.get_results(round_id)
+    total_votes = await async_db.get_total_votes(round_id)
 
     vote_results = [
         VoteResult(
@@ -175,27 +588,60 @@ async def get_results():
 
     return ResultsSummary(
         results=vote_results,
-        total_votes=total_votes
+        total_votes=total_votes,
+        round_id=round_id
     )
 
 
+@app.get("/api/rounds", response_model=List[RoundInfo], tags=["Ergebnisse"])
+async def get_rounds():
+    """Gibt alle Abstimmungsrunden mit ihrer Stimmenanzahl zurück"""
+    rounds = await async_db.get_rounds()
+    current_round = db.get_current_round()
+    return [
+        RoundInfo(
+            round_id=r['round_id'],
+            started_at=str(r['started_at']),
+            vote_count=r['vote_count'],
+            current=r['round_id'] == current_round
+        )
+        for r in rounds
+    ]
+
+
+@app.get("/api/elections", response_model=List[ElectionInfo], tags=["Ergebnisse"])
+async def get_elections():
+    """Gibt alle Wahlen zurück; abgeschlossene Wahlen bleiben über /api/export?election=N exportierbar"""
+    elections = await async_db.get_elections()
+    return [
+        ElectionInfo(
+            election_id=e['election_id'],
+            started_at=str(e['started_at']),
+            ended_at=str(e['ended_at']) if e['ended_at'] else None,
+            vote_count=e['vote_count'],
+            archived=e['archived'],
+            current=e['current']
+        )
+        for e in elections
+    ]
+
+
 # === ADMIN-ENDPOINTS ===
 
 @app.post("/api/admin/reset", response_model=ResetResponse, tags=["Admin"])
 async def reset_votes():
     """
     Setzt alle Stimmen zurück
-    Kandidaten bleiben erhalten, alle Votes werden gelöscht
+    Kandidaten bleiben erhalten, die bisherigen Votes werden im Hintergrund archiviert
     """
-    db.reset_votes()
+    await async_db.reset_votes()
 
-    # Benachrichtige alle Clients
+    # Benachrichtige alle Clients (Stimmen der alten Wahl nicht mehr nachmelden)
+    results_publisher.discard_votes()
     await ws_manager.broadcast_reset()
 
     # Sende leere Ergebnisse
-    results = db.get_results()
-    total_votes = db.get_total_votes()
-    await ws_manager.broadcast_results(results, total_votes)
+    await results_publisher.publish()
 
     return ResetResponse(
         success=True,
@@ -209,7 +655,7 @@ async def unlock_clients():
     Entsperrt alle Clients für eine neue Abstimmungsrunde
     Votes bleiben erhalten
     """
-    db.unlock_clients()
+    await async_db.unlock_clients()
 
     # Benachrichtige alle Clients
     await ws_manager.broadcast_unlock()
@@ -221,26 +667,143 @@ async def unlock_clients():
 
 
 @app.get("/api/admin/status", response_model=ServerStatus, tags=["Admin"])
-async def get_server_status():
-    """Gibt den aktuellen Server-Status zurück"""
-    candidates = db.get_candidates()
-    total_votes = db.get_total_votes()
-
-    return ServerStatus(
-        running=True,
-        total_candidates=len(candidates),
-        total_votes=total_votes,
-        port=8000
+async def get_server_status(request: Request):
+    """Gibt den aktuellen Server-Status zurück (aus dem Response-Cache)"""
+    async def build():
+        total_votes = await async_db.get_total_votes()
+        return ServerStatus(
+            running=True,
+            total_candidates=db.count_candidates(),
+            total_votes=total_votes,
+            port=8000
+        )
+
+    return await _cached_json(request, "status", build)
+
+
+@app.post("/api/admin/tallies/verify", tags=["Admin"])
+async def verify_tallies():
+    """Prüft die materialisierten Stimmen-Zähler und baut sie bei Abweichung neu auf"""
+    return await async_db.verify_tallies()
+
+
+@app.get("/api/admin/metrics", tags=["Admin"])
+async def get_metrics():
+    """Gibt interne Metriken zurück (Vote-Writer, Client-Index, Lock-Wartezeiten, Response-Cache, Export-Jobs, Rate-Limits, Warteraum, WebSocket, Ergebnis-Updates)"""
+    return {
+        "vote_writer": db.vote_writer.get_stats() if db.vote_writer else None,
+        "voted_index": db.get_voted_index_stats(),
+        "db_locks": db.lock.get_stats(),
+        "response_cache": response_cache.get_stats(),
+        "export_jobs": export_jobs.get_stats(),
+        "rate_limits": {path: limiter.get_stats() for path, limiter in RATE_LIMITS.items()},
+        "vote_admission": vote_admission.get_stats(),
+        "websocket": ws_manager.get_stats(),
+        "results_publisher": results_publisher.get_stats()
+    }
+
+
+# === PROFILING-ENDPOINTS ===
+
+def require_local_client(request: Request):
+    """Profiling nur vom Server-Rechner selbst (Admin-GUI), nicht von den Wahl-Clients im LAN"""
+    if request.client is None or request.client.host not in ("127.0.0.1", "::1"):
+        raise HTTPException(status_code=403, detail="Nur lokal auf dem Server erlaubt")
+
+
+@app.get("/api/admin/profiling", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def get_profiling_status():
+    """Gibt den Status von Anfragen-Profiler, Prozess-Sampler und Slow-Request-Log zurück"""
+    return {
+        "requests": request_profiler.get_status(),
+        "process": process_sampler.get_status(),
+        "slow_requests": slow_request_log.get_status()
+    }
+
+
+@app.post("/api/admin/profiling/requests/start", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def start_request_profiling(sample_rate: float = Query(0.1, gt=0, le=1)):
+    """Startet cProfile für einen Anteil der Anfragen (verwirft die vorherige Aufzeichnung)"""
+    request_profiler.start(sample_rate)
+    return request_profiler.get_status()
+
+
+@app.post("/api/admin/profiling/requests/stop", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def stop_request_profiling():
+    """Beendet das Anfragen-Profiling; die Aufzeichnung bleibt zum Download"""
+    request_profiler.stop()
+    return request_profiler.get_status()
+
+
+@app.get("/api/admin/profiling/requests/download", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def download_request_profile():
+    """Liefert die Aufzeichnung als .pstats-Datei (z.B. für snakeviz oder python -m pstats)"""
+    data = request_profiler.dump()
+    if data is None:
+        raise HTTPException(status_code=409, detail="Keine Aufzeichnung vorhanden")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Response(
+        data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="anfragen_{timestamp}.pstats"'}
+    )
+
+
+@app.post("/api/admin/profiling/process/start", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def start_process_profiling(
+    duration: float = Query(10.0, gt=0, le=300),
+    interval_ms: float = Query(5.0, ge=1, le=1000)
+):
+    """Startet den Prozess-Sampler (alle Threads) für `duration` Sekunden"""
+    if not process_sampler.start(duration, interval_ms / 1000):
+        raise HTTPException(status_code=409, detail="Sampler läuft bereits")
+    return process_sampler.get_status()
+
+
+@app.post("/api/admin/profiling/process/stop", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def stop_process_profiling():
+    """Beendet den Prozess-Sampler vorzeitig"""
+    await run_in_threadpool(process_sampler.stop)
+    return process_sampler.get_status()
+
+
+@app.get("/api/admin/profiling/process/download", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def download_process_profile():
+    """Liefert die Stacks im Collapsed-Format (für flamegraph.pl oder speedscope)"""
+    data = process_sampler.dump()
+    if data is None:
+        raise HTTPException(status_code=409, detail="Sampler läuft noch oder hat keine Daten")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Response(
+        data,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="prozess_{timestamp}.collapsed"'}
     )
 
 
+@app.post("/api/admin/profiling/slow-requests", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def set_slow_request_threshold(threshold_ms: float = Query(..., ge=0)):
+    """Setzt die Schwelle für das Slow-Request-Log (0 schaltet es aus)"""
+    slow_request_log.threshold = threshold_ms / 1000
+    return slow_request_log.get_status()
+
+
+@app.get("/api/admin/profiling/slow-requests", tags=["Admin"], dependencies=[Depends(require_local_client)])
+async def get_slow_requests():
+    """Gibt die zuletzt protokollierten langsamen Anfragen mit ihren teuersten DB-Methoden zurück"""
+    return slow_request_log.get_entries()
+
+
 # === SETTINGS-ENDPOINTS ===
 
 @app.get("/api/settings/vote-title", tags=["Settings"])
-async def get_vote_title():
-    """Gibt den aktuellen Wahl-title zurück"""
-    title = db.get_setting("vote_title")
-    return {"title": title or "made with ♥ by @enl1qhtnd"}
+async def get_vote_title(request: Request):
+    """Gibt den aktuellen Wahl-title zurück (aus dem Response-Cache)"""
+    async def build():
+        title = await async_db.get_setting("vote_title")
+        return {"title": title or "made with ♥ by @enl1qhtnd"}
+
+    return await _cached_json(request, "vote_title", build)
 
 
 @app.post("/api/settings/vote-title", tags=["Settings"])
@@ -249,67 +812,84 @@ async def set_vote_title(title: str):
     if not title or len(title.strip()) == 0:
         raise HTTPException(status_code=400, detail="Titel darf nicht leer sein")
 
-    db.set_setting("vote_title", title.strip())
+    await async_db.set_setting("vote_title", title.strip())
     return {"success": True, "title": title.strip()}
 
 
 # === EXCEL-EXPORT ===
 
+async def _get_archive_path(election_id: int) -> str:
+    """Gibt den Archivpfad einer abgeschlossenen Wahl zurück (404 unbekannt, 409 noch nicht archiviert)"""
+    election = await async_db.get_election_archive(election_id)
+    if not election:
+        raise HTTPException(status_code=404, detail="Abgeschlossene Wahl nicht gefunden")
+    if not election['archive_path']:
+        raise HTTPException(status_code=409, detail="Wahl wird noch archiviert, bitte später erneut versuchen")
+    return election['archive_path']
+
+
 @app.get("/api/export", tags=["Export"])
-async def export_results():
+async def export_results(election_id: Optional[int] = Query(None, alias="election", gt=0)):
     """
     Exportiert die Abstimmungsergebnisse als Excel-Datei
+    Mit ?election=N wird eine abgeschlossene Wahl aus ihrem Archiv exportiert
+    Die Datei wird beim Schreiben gestreamt (kein Temp-File, begrenzter Speicher)
     """
-    # Erstelle Workbook
-    wb = Workbook()
-
-    # Sheet 1: Zusammenfassung
-    ws_summary = wb.active
-    ws_summary.title = "Zusammenfassung"
-    ws_summary.append(["Kandidat", "Beschreibung", "Stimmen", "Prozent"])
-
-    results = db.get_results()
-    
-    # Berechne Gesamtstimmen für Prozentberechnung
-    total_votes = sum(result['vote_count'] for result in results)
-    
-    for result in results:
-        # Berechne Prozentsatz (mit Schutz vor Division durch Null)
-        percentage = (result['vote_count'] / total_votes * 100) if total_votes > 0 else 0
-        
-        ws_summary.append([
-            result['candidate_name'],
-            result.get('description', ''),
-            result['vote_count'],
-            f"{percentage:.2f}%"
-        ])
-
-    # Sheet 2: Detaillierte Votes
-    ws_details = wb.create_sheet("Detaillierte Votes")
-    ws_details.append(["Vote ID", "Kandidat", "Client ID", "Zeitstempel"])
-
-    votes = db.get_all_votes_detailed()
-    for vote in votes:
-        ws_details.append([
-            vote['vote_id'],
-            vote['candidate_name'],
-            vote['client_id'],
-            vote['timestamp']
-        ])
-
-    # Speichere Datei
+    if election_id is not None:
+        archive_path = await _get_archive_path(election_id)
+        snapshot = await run_in_threadpool(db.open_archive_snapshot, archive_path)
+    else:
+        # Eigene Lesetransaktion: Zusammenfassung und Stimmen zeigen denselben Stand
+        snapshot = await run_in_threadpool(db.open_export_snapshot)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"abstimmung_ergebnisse_{timestamp}.xlsx"
-    
-    # Verwende temporäres Verzeichnis (Windows-kompatibel)
-    temp_dir = tempfile.gettempdir()
-    filepath = os.path.join(temp_dir, filename)
+    if election_id is not None:
+        filename = f"abstimmung_ergebnisse_wahl_{election_id}_{timestamp}.xlsx"
+    else:
+        filename = f"abstimmung_ergebnisse_{timestamp}.xlsx"
+
+    # Workbook-Aufbau läuft in einem eigenen Thread, der Event-Loop reicht nur Bytes weiter
+    return StreamingResponse(
+        stream_workbook(snapshot.results, snapshot),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
-    wb.save(filepath)
 
-    # Sende Datei
+@app.post("/api/export/jobs", response_model=ExportJob, status_code=202, tags=["Export"])
+async def start_export_job(election_id: Optional[int] = Query(None, alias="election", gt=0)):
+    """
+    Startet einen Export im Hintergrund und gibt den Job zurück
+    Hat sich seit dem letzten Export nichts geändert, wird dessen Datei wiederverwendet
+    """
+    archive_path = await _get_archive_path(election_id) if election_id is not None else None
+    return export_jobs.start(election_id, archive_path)
+
+
+@app.get("/api/export/jobs/{job_id}", response_model=ExportJob, tags=["Export"])
+async def get_export_job(job_id: str):
+    """Gibt Status und Fortschritt eines Export-Jobs zurück"""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export-Job nicht gefunden")
+    return job
+
+
+@app.get("/api/export/jobs/{job_id}/download", tags=["Export"])
+async def download_export_job(job_id: str):
+    """Liefert die fertige Excel-Datei eines Export-Jobs"""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export-Job nicht gefunden")
+    if job['status'] == "expired":
+        raise HTTPException(status_code=410, detail="Export ist veraltet, bitte neu starten")
+    artifact = export_jobs.get_artifact(job_id)
+    if not artifact:
+        raise HTTPException(status_code=409, detail=f"Export ist noch nicht fertig (Status: {job['status']})")
+
+    path, filename = artifact
     return FileResponse(
-        filepath,
+        path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         filename=filename
     )
@@ -326,22 +906,20 @@ async def websocket_endpoint(websocket: WebSocket):
     await ws_manager.connect(websocket)
 
     try:
-        # Sende initiale Daten
-        results = db.get_results()
-        total_votes = db.get_total_votes()
-        await websocket.send_json({
-            "type": "initial_data",
-            "data": {
-                "results": results,
-                "total_votes": total_votes
-            }
-        })
+        # Sende initiale Daten mit Sequenznummer; danach folgen Deltas
+        # (über die Warteschlange, damit nur der Writer-Task sendet)
+        ws_manager.send(websocket, {"type": "initial_data", "data": await results_publisher.snapshot()})
 
         # Halte Verbindung offen
         while True:
             # Warte auf Client-Nachrichten (optional)
             data = await websocket.receive_text()
-            # Könnte für Ping/Pong verwendet werden
+            # Ping/Pong für Verbindungs- und Latenz-Checks
+            if data == "ping":
+                ws_manager.send(websocket, {"type": "pong"})
+            # Client hat eine Sequenznummer verpasst: vollständigen Stand erneut senden
+            elif data == "resync":
+                ws_manager.send(websocket, {"type": "results_update", "data": await results_publisher.snapshot()})
 
     except WebSocketDisconnect:
         await ws_manager.disconnect(websocket)
@@ -362,6 +940,12 @@ async def root():
     }
 
 
+@app.get("/metrics", tags=["System"])
+async def get_prometheus_metrics():
+    """Gibt alle Metriken im Prometheus-Textformat zurück"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # === SERVER-FUNKTION (für GUI) ===
 
 def run_server(host: str = "0.0.0.0", port: int = 8000):
@@ -0,0 +1,113 @@
+"""
+Async-Fassade für den Datenbank-Manager
+Führt die blockierenden Database-Methoden auf einem begrenzten Thread-Pool
+aus, damit der Event-Loop (HTTP und WebSocket) nie auf SQLite wartet
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+import asyncio
+import contextvars
+
+from database import Database
+
+
+class AsyncDatabase:
+    def __init__(self, db: Database, max_workers: int = 4):
+        """
+        db: der synchrone Datenbank-Manager
+        max_workers: Größe des Thread-Pools (jeder Thread nutzt seine eigene Pool-Verbindung)
+        """
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    async def _run(self, func, *args):
+        """Führt eine blockierende Methode im DB-Thread-Pool aus (mit den ContextVars der Anfrage)"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, partial(context.run, func, *args))
+
+    def close(self):
+        """Beendet den Thread-Pool und schließt die Datenbank"""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+    # === KANDIDATEN-VERWALTUNG ===
+
+    async def add_candidate(self, name: str, description: str = "") -> int:
+        return await self._run(self.db.add_candidate, name, description)
+
+    async def get_candidates(self) -> List[Dict]:
+        return await self._run(self.db.get_candidates)
+
+    async def update_candidate(self, candidate_id: int, name: str, description: str = "") -> bool:
+        return await self._run(self.db.update_candidate, candidate_id, name, description)
+
+    async def delete_candidate(self, candidate_id: int) -> bool:
+        return await self._run(self.db.delete_candidate, candidate_id)
+
+    # === VOTING ===
+
+    async def cast_vote(self, client_id: str, candidate_id: int) -> bool:
+        """Gibt eine Stimme ab; mit Group-Commit wird direkt auf den Batch gewartet"""
+        if self.db.vote_writer:
+            return await asyncio.wrap_future(self.db.submit_vote(client_id, candidate_id))
+        return await self._run(self.db.cast_vote, client_id, candidate_id)
+
+    async def has_voted(self, client_id: str) -> bool:
+        # Reiner Lookup im Client-Index, kein Thread-Wechsel nötig
+        return self.db.has_voted(client_id)
+
+    # === ERGEBNISSE ===
+
+    async def get_results(self, round_id: Optional[int] = None) -> List[Dict]:
+        return await self._run(self.db.get_results, round_id)
+
+    async def get_total_votes(self, round_id: Optional[int] = None) -> int:
+        return await self._run(self.db.get_total_votes, round_id)
+
+    async def get_data_version(self) -> str:
+        # Zähler im Speicher, kein Thread-Wechsel nötig
+        return self.db.get_data_version()
+
+    async def verify_tallies(self) -> Dict:
+        return await self._run(self.db.verify_tallies)
+
+    # === RUNDEN ===
+
+    async def get_rounds(self) -> List[Dict]:
+        return await self._run(self.db.get_rounds)
+
+    async def round_exists(self, round_id: int) -> bool:
+        return await self._run(self.db.round_exists, round_id)
+
+    # === WAHLEN UND ARCHIV ===
+
+    async def get_elections(self) -> List[Dict]:
+        return await self._run(self.db.get_elections)
+
+    async def get_election_archive(self, election_id: int) -> Optional[Dict]:
+        return await self._run(self.db.get_election_archive, election_id)
+
+    # === ADMIN-FUNKTIONEN ===
+
+    async def reset_votes(self):
+        return await self._run(self.db.reset_votes)
+
+    async def unlock_clients(self):
+        return await self._run(self.db.unlock_clients)
+
+    async def reset_database(self):
+        return await self._run(self.db.reset_database)
+
+    # === SETTINGS-VERWALTUNG ===
+
+    async def get_setting(self, key: str) -> Optional[str]:
+        return await self._run(self.db.get_setting, key)
+
+    async def set_setting(self, key: str, value: str):
+        return await self._run(self.db.set_setting, key, value)
+
+    async def get_all_votes_detailed(self) -> List[Dict]:
+        return await self._run(self.db.get_all_votes_detailed)
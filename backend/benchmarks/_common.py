@@ -0,0 +1,251 @@
+"""
+Gemeinsame Hilfsfunktionen der Benchmarks
+Damit alle Skripte dieselben Testdaten, dieselbe Perzentil-Definition und
+dieselben simulierten Clients verwenden. Wird von den Skripten nach dem
+Eintragen des backend-Verzeichnisses in sys.path importiert.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# === AUSWERTUNG ===
+
+def percentile(values: List[float], p: float) -> float:
+    """Wert, unter dem der Anteil `p` der Messungen liegt (p=1.0: Maximum); 0.0 ohne Messungen"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+# === TESTDATEN ===
+
+def client_ip(index: int, prefix: int = 10) -> str:
+    """Eindeutige Client-IP pro Index (bis 2^24 Clients)"""
+    return f"{prefix}.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+
+
+def generate_votes(rng: random.Random, votes: int, candidate_ids: List[int]) -> Iterator[Tuple[int, str, str]]:
+    """Erzeugt (Kandidat, Client-ID, Zeitstempel) mit festem Seed; Kandidaten ungleich beliebt"""
+    weights = [rng.random() ** 2 for _ in candidate_ids]
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    chosen = rng.choices(candidate_ids, weights=weights, k=votes)
+    for i, candidate_id in enumerate(chosen):
+        yield candidate_id, client_ip(i), str(start + timedelta(milliseconds=i * 7))
+
+
+def populate(db, votes: int, candidates: int, seed: int = 42) -> List[int]:
+    """
+    Legt Kandidaten, Stimmen und Teilnehmer der aktuellen Runde direkt per SQL an
+    (Client-IDs wie client_ip(0 ... votes-1)) und baut die Stimmen-Zähler neu auf
+    Der Client-Index im Speicher kennt die neuen Teilnehmer erst nach erneutem Öffnen.
+    Returns: Kandidaten-IDs
+    """
+    rng = random.Random(seed)
+    with db.lock.write("populate"), db._cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO candidates (name, description) VALUES (?, ?)",
+            ((f"Kandidat {i}", f"Beschreibung {i}") for i in range(candidates))
+        )
+        candidate_ids = [row[0] for row in cursor.execute("SELECT id FROM candidates ORDER BY id")]
+        round_id = db.get_current_round()
+        rows = list(generate_votes(rng, votes, candidate_ids))
+        cursor.executemany(
+            "INSERT INTO votes (candidate_id, client_id, timestamp, round_id) VALUES (?, ?, ?, ?)",
+            ((candidate_id, client_id, timestamp, round_id) for candidate_id, client_id, timestamp in rows)
+        )
+        cursor.executemany(
+            "INSERT INTO round_participants (round_id, client_id, voted_at) VALUES (?, ?, ?)",
+            ((round_id, client_id, timestamp) for _, client_id, timestamp in rows)
+        )
+    # Meldung "weicht ab - wird neu aufgebaut" ist hier erwartet
+    with contextlib.redirect_stdout(None):
+        db.verify_tallies()
+    return candidate_ids
+
+
+def cast_votes(db, votes: int, threads: int, candidate_ids: List[int]) -> float:
+    """
+    Gibt Stimmen von `votes` verschiedenen Clients aus `threads` Threads gleichzeitig ab
+    (ein Thread pro wartendem HTTP-Request); Returns: Stimmen/s ab dem gemeinsamen Start
+    """
+    start_signal = threading.Event()
+
+    def worker(offset: int):
+        start_signal.wait()
+        for i in range(offset, votes, threads):
+            assert db.cast_vote(client_ip(i), candidate_ids[i % len(candidate_ids)])
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in workers:
+        t.start()
+    start = time.perf_counter()
+    start_signal.set()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    assert db.get_total_votes() == votes
+    return votes / elapsed
+
+
+@contextlib.contextmanager
+def temp_api(candidates: int = 0):
+    """
+    Importiert api.py in einem temporären Verzeichnis (api.py legt poll.db im
+    Arbeitsverzeichnis an) und legt `candidates` Kandidaten an
+    Returns: (api-Modul, Kandidaten-IDs); schließt am Ende die Datenbank
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            import api
+            candidate_ids = [api.db.add_candidate(f"Kandidat {i}", f"Beschreibung {i}") for i in range(candidates)]
+            try:
+                yield api, candidate_ids
+            finally:
+                api.async_db.close()
+        finally:
+            os.chdir(cwd)
+
+
+# === ASGI-CLIENT ===
+
+async def asgi_request(app, method: str, path: str, client: str = "127.0.0.1", payload: Optional[dict] = None,
+                       headers: Optional[List[Tuple[bytes, bytes]]] = None) -> Tuple[Dict, asyncio.Task]:
+    """
+    Schickt eine Anfrage direkt an die ASGI-App (ohne Netzwerk) und wartet auf das letzte Antwort-Byte
+    Returns: ({status, headers, body, latency}, App-Task inkl. Hintergrund-Tasks nach der Antwort)
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    if headers is None:
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": (client, 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    response = {"status": None, "headers": {}, "body": b"", "latency": None}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Verbindung bleibt offen, bis die App fertig ist
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+            if not message.get("more_body", False):
+                response_done.set()
+
+    start = time.perf_counter()
+    task = asyncio.create_task(app(scope, receive, send))
+    await response_done.wait()
+    response["latency"] = time.perf_counter() - start
+    return response, task
+
+
+async def post_vote(app, client: str, candidate_id: int) -> Tuple[Dict, asyncio.Task]:
+    """POST /api/vote direkt an die ASGI-App; Returns: wie asgi_request"""
+    return await asgi_request(app, "POST", "/api/vote", client, {"candidate_id": candidate_id})
+
+
+# === WEBSOCKET ===
+
+class Delivery:
+    """Zählt zugestellte Nachrichten und meldet, wenn `target` erreicht ist"""
+
+    def __init__(self):
+        self.count = 0
+        self.target = 0
+        self.done = asyncio.Event()
+
+    def expect(self, target: int):
+        self.count = 0
+        self.target = target
+        self.done.clear()
+
+    def delivered(self):
+        self.count += 1
+        if self.count == self.target:
+            self.done.set()
+
+
+class FakeWebSocket:
+    """
+    Zuhörer ohne Netzwerk: kodiert jede Nachricht wie Starlette/uvicorn nach UTF-8
+    delay: Sendedauer pro Nachricht in s (None: gibt den Event-Loop nicht ab)
+    delivery: meldet jede gesendete Nachricht
+    """
+
+    def __init__(self, delay: Optional[float] = None, delivery: Optional[Delivery] = None):
+        self.delay = delay
+        self.delivery = delivery
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = None):
+        pass
+
+    async def send_text(self, text: str):
+        text.encode("utf-8")
+        await self._delivered()
+
+    async def send_json(self, message: dict):
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        await self._delivered()
+
+    async def send_bytes(self, data: bytes):
+        await self._delivered()
+
+    async def _delivered(self):
+        if self.delay is not None:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        if self.delivery:
+            self.delivery.delivered()
+
+
+def results_message(i: int, candidates: int) -> dict:
+    """Vollständiges Ergebnis-Update mit `candidates` Kandidaten (Stimmenzahlen abhängig von `i`)"""
+    return {
+        "type": "results_update",
+        "data": {
+            "results": [
+                {"id": c, "name": f"Kandidat {c}", "description": f"Beschreibung für Kandidat {c}",
+                 "votes": i + c, "percentage": round(100 / candidates, 2)}
+                for c in range(candidates)
+            ],
+            "total_votes": i * candidates,
+        },
+    }
@@ -0,0 +1,60 @@
+"""
+Benchmark: Stimmabgaben pro Sekunde mit und ohne Connection-Pool
+
+Vergleicht das frühere Verhalten (neue Verbindung pro Aufruf, Rollback-Journal)
+mit dem Connection-Pool (langlebige Verbindungen pro Thread, WAL-Modus).
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_connection_pool.py --votes 2000 --threads 8
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _common import cast_votes  # noqa: E402
+from database import Database  # noqa: E402
+
+
+class UnpooledDatabase(Database):
+    """Verhalten vor dem Connection-Pool: eine neue Verbindung pro Aufruf"""
+
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = DELETE")
+        # Verbindung wird geschlossen, sobald die Methode sie freigibt
+        return conn
+
+
+def run(db_class, db_path: str, votes: int, threads: int, candidates: int = 10) -> float:
+    """Gibt Stimmen von `votes` verschiedenen Clients ab und misst Stimmen/s"""
+    db = db_class(db_path)
+    candidate_ids = [db.add_candidate(f"Kandidat {i}") for i in range(candidates)]
+    rate = cast_votes(db, votes, threads, candidate_ids)
+    db.close()
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run(UnpooledDatabase, str(Path(tmp) / "unpooled.db"), args.votes, args.threads)
+        after = run(Database, str(Path(tmp) / "pooled.db"), args.votes, args.threads)
+
+    print(f"Stimmen: {args.votes}, Threads: {args.threads}")
+    print(f"  ohne Pool (Rollback-Journal): {before:10.0f} Stimmen/s")
+    print(f"  mit Pool (WAL):               {after:10.0f} Stimmen/s")
+    print(f"  Faktor:                       {after / before:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
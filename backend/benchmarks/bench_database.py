@@ -0,0 +1,216 @@
+"""
+Micro-Benchmarks für die Database-Methoden mit Baselines
+
+Misst cast_vote, has_voted, get_results, get_total_votes, get_candidates,
+unlock_clients, reset_votes und get_all_votes_detailed bei verschiedenen
+Datenmengen (Stimmen x Kandidaten). Die Testdaten kommen aus einem Generator
+mit festem Seed, sodass jeder Lauf dieselbe Datenbank erzeugt.
+
+Ergebnisse werden als JSON gespeichert; `compare` vergleicht zwei Läufe und
+meldet Verschlechterungen über der Schwelle (Exit-Code 1).
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_database.py run --output benchmarks/baselines/database.json
+    python benchmarks/bench_database.py run --votes 1000 100000 --output aktuell.json
+    python benchmarks/bench_database.py compare benchmarks/baselines/database.json aktuell.json
+    python benchmarks/bench_database.py run --compare benchmarks/baselines/database.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import populate  # noqa: E402
+from database import Database  # noqa: E402
+
+DEFAULT_VOTES = [1_000, 100_000, 1_000_000]
+DEFAULT_CANDIDATES = [10, 1_000]
+
+
+# === MESSUNG ===
+
+def measure(func: Callable[[int], None], repeat: int, target: float, max_calls: int = 100_000) -> Dict:
+    """
+    Ruft func(i) in `repeat` Durchgängen auf; die Zahl der Aufrufe pro Durchgang
+    wird so gewählt, dass ein Durchgang etwa `target` Sekunden dauert
+    Returns: Median und Minimum pro Aufruf in µs
+    """
+    start = time.perf_counter()
+    func(0)
+    single = time.perf_counter() - start
+    calls = max(1, min(max_calls, int(target / max(single, 1e-7))))
+
+    counter = 1
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func(counter)
+            counter += 1
+        per_call.append((time.perf_counter() - start) / calls)
+
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "min_us": round(min(per_call) * 1e6, 3),
+        "calls": calls * repeat + 1,
+    }
+
+
+def measure_once(func: Callable[[], None]) -> Dict:
+    """Für Methoden, die beim ersten Aufruf den ganzen Datenbestand verarbeiten und danach nichts mehr zu tun haben"""
+    start = time.perf_counter()
+    func()
+    elapsed = round((time.perf_counter() - start) * 1e6, 3)
+    return {"median_us": elapsed, "min_us": elapsed, "calls": 1}
+
+
+def run_scenario(votes: int, candidates: int, seed: int, repeat: int, target: float) -> Dict[str, Dict]:
+    """Misst alle Methoden auf einer frisch erzeugten Datenbank"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        db = Database(db_path)
+        populate(db, votes, candidates, seed)
+        # Neu öffnen, damit der Client-Index die Teilnehmer kennt
+        db.close()
+        db = Database(db_path)
+        candidate_ids = [c["id"] for c in db.get_candidates()]
+        results = {}
+
+        # Lesende Methoden zuerst, solange die Datenmenge der Vorgabe entspricht
+        results["has_voted"] = measure(
+            lambda i: db.has_voted(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" if i % 2 else f"neu-{i}"),
+            repeat, target
+        )
+        results["get_results"] = measure(lambda i: db.get_results(), repeat, target)
+        results["get_total_votes"] = measure(lambda i: db.get_total_votes(), repeat, target)
+        results["get_candidates"] = measure(lambda i: db.get_candidates(), repeat, target)
+        results["get_all_votes_detailed"] = measure(lambda i: db.get_all_votes_detailed(), repeat, target)
+
+        # Schreibende Methoden: jede Stimme von einem neuen Client
+        results["cast_vote"] = measure(
+            lambda i: db.cast_vote(f"bench-{i}", candidate_ids[i % len(candidate_ids)]), repeat, target,
+            max_calls=2_000
+        )
+        # Freigeben und Zurücksetzen verarbeiten alle Teilnehmer bzw. Stimmen auf einmal;
+        # das Archivieren der abgeschlossenen Wahl läuft im Hintergrund und zählt nicht mit
+        results["unlock_clients"] = measure_once(db.unlock_clients)
+        results["reset_votes"] = measure_once(db.reset_votes)
+
+        db.archiver.wait_idle(600)
+        db.close()
+    return results
+
+
+# === VERGLEICH ===
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> bool:
+    """Vergleicht Median-Zeiten; Returns: True wenn eine Methode um mehr als `threshold` langsamer ist"""
+    regressions = 0
+    print(f"{'Szenario':28s} {'Methode':24s} {'Baseline':>12s} {'Aktuell':>12s} {'Änderung':>9s}")
+    for scenario, methods in current["results"].items():
+        base_methods = baseline["results"].get(scenario)
+        if base_methods is None:
+            print(f"{scenario:28s} (nicht in der Baseline)")
+            continue
+        for method, result in methods.items():
+            base = base_methods.get(method)
+            if base is None:
+                continue
+            change = result["median_us"] / base["median_us"] - 1 if base["median_us"] else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  LANGSAMER"
+                regressions += 1
+            elif change < -threshold:
+                flag = "  schneller"
+            print(f"{scenario:28s} {method:24s} {base['median_us']:10.1f}µs {result['median_us']:10.1f}µs "
+                  f"{change * 100:+8.1f}%{flag}")
+
+    print(f"\n{regressions} Verschlechterung(en) über {threshold * 100:.0f}%")
+    return regressions > 0
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Benchmarks ausführen")
+    run_parser.add_argument("--votes", type=int, nargs="+", default=DEFAULT_VOTES)
+    run_parser.add_argument("--candidates", type=int, nargs="+", default=DEFAULT_CANDIDATES)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--repeat", type=int, default=5, help="Durchgänge pro Methode")
+    run_parser.add_argument("--target", type=float, default=0.05, help="Dauer (s) eines Durchgangs")
+    run_parser.add_argument("--output", help="Ergebnis als JSON speichern (z.B. als neue Baseline)")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="direkt mit einer Baseline vergleichen")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="erlaubte Verschlechterung (0.2 = 20%%)")
+
+    compare_parser = commands.add_parser("compare", help="zwei Ergebnisse vergleichen")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="erlaubte Verschlechterung (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        sys.exit(1 if compare(load(args.baseline), load(args.current), args.threshold) else 0)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": {},
+    }
+    for votes in args.votes:
+        for candidates in args.candidates:
+            scenario = f"votes={votes},candidates={candidates}"
+            print(f"{scenario} ...", flush=True)
+            # Meldungen der Datenbank (z.B. "Wahl archiviert") würden die Tabelle zerreißen
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = run_scenario(votes, candidates, args.seed, args.repeat, args.target)
+            report["results"][scenario] = results
+            for method, result in results.items():
+                print(f"  {method:24s} {result['median_us']:12.1f} µs (min {result['min_us']:.1f} µs)")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Gespeichert: {args.output}")
+
+    if args.compare:
+        print()
+        sys.exit(1 if compare(load(args.compare), report, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
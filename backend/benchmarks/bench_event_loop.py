@@ -0,0 +1,73 @@
+"""
+Benchmark: WebSocket-Pings während eines langen Excel-Exports
+
+Füllt eine temporäre Datenbank, startet /api/export und misst parallel die
+Round-Trip-Zeit von WebSocket-Pings. Blockiert der Export den Event-Loop,
+bleiben die Pongs bis zum Ende des Exports aus.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_event_loop.py --votes 200000
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import populate, temp_api  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=200_000)
+    parser.add_argument("--max-gap-ms", type=float, default=250.0,
+                        help="maximal erlaubte Ping-Round-Trip-Zeit während des Exports")
+    args = parser.parse_args()
+
+    with temp_api() as (api, _):
+        from fastapi.testclient import TestClient
+
+        populate(api.db, args.votes, 1)
+
+        with TestClient(api.app) as client, client.websocket_connect("/ws") as ws:
+            ws.receive_json()  # initial_data
+
+            export_done = threading.Event()
+            export_time = []
+
+            def run_export():
+                start = time.perf_counter()
+                response = client.get("/api/export")
+                export_time.append(time.perf_counter() - start)
+                assert response.status_code == 200
+                export_done.set()
+
+            exporter = threading.Thread(target=run_export)
+            exporter.start()
+
+            round_trips = []
+            while not export_done.is_set():
+                start = time.perf_counter()
+                ws.send_text("ping")
+                while ws.receive_json()["type"] != "pong":
+                    pass
+                round_trips.append(time.perf_counter() - start)
+                time.sleep(0.01)
+            exporter.join()
+
+    worst = max(round_trips) * 1000
+    print(f"Stimmen: {args.votes}, Export-Dauer: {export_time[0]:.2f} s")
+    print(f"  Pings während des Exports: {len(round_trips)}")
+    print(f"  Round-Trip Median: {sorted(round_trips)[len(round_trips) // 2] * 1000:.1f} ms, max: {worst:.1f} ms")
+    if worst > args.max_gap_ms:
+        print(f"FEHLER: Event-Loop war bis zu {worst:.0f} ms blockiert (Grenze {args.max_gap_ms:.0f} ms)")
+        sys.exit(1)
+    print("OK: WebSocket-Pings laufen während des Exports weiter")
+
+
+if __name__ == "__main__":
+    main()
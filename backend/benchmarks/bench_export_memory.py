@@ -0,0 +1,81 @@
+"""
+Benchmark: Speicherverbrauch des Excel-Exports
+
+Vergleicht den Streaming-Export (write-only-Arbeitsmappe aus einem Cursor)
+mit dem früheren Vorgehen (alle Stimmen als Liste laden, normale Arbeitsmappe
+im Speicher aufbauen). Gemessen wird die Python-Heap-Spitze mit tracemalloc.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_export_memory.py --votes 500000
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openpyxl import Workbook
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import populate  # noqa: E402
+from database import Database  # noqa: E402
+from excel_export import stream_workbook  # noqa: E402
+
+
+def export_streaming(db: Database) -> int:
+    """Streaming-Export; Returns: Dateigröße in Bytes"""
+    snapshot = db.open_export_snapshot()
+    return sum(len(chunk) for chunk in stream_workbook(snapshot.results, snapshot))
+
+
+def export_in_memory(db: Database) -> int:
+    """Bisheriger Export (normale Arbeitsmappe); Returns: Dateigröße in Bytes"""
+    wb = Workbook()
+    ws_summary = wb.active
+    ws_summary.title = "Zusammenfassung"
+    for result in db.get_results():
+        ws_summary.append([result['candidate_name'], result['description'], result['vote_count']])
+    ws_details = wb.create_sheet("Detaillierte Votes")
+    for vote in db.get_all_votes_detailed():
+        ws_details.append([vote['vote_id'], vote['round_id'], vote['candidate_name'],
+                           vote['client_id'], vote['timestamp']])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.tell()
+
+
+def measure(name: str, export, db: Database):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = export(db)
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {name:12s} Dauer: {duration:6.2f} s, Datei: {size / 1024 / 1024:6.1f} MB, "
+          f"Heap-Spitze: {peak / 1024 / 1024:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=500_000)
+    parser.add_argument("--skip-in-memory", action="store_true", help="nur den Streaming-Export messen")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "bench.db"))
+        populate(db, args.votes, 10)
+
+        print(f"Stimmen: {args.votes}")
+        measure("Streaming", export_streaming, db)
+        if not args.skip_in_memory:
+            measure("In-Memory", export_in_memory, db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: Query-Pläne und Laufzeiten vor und nach den Index-Migrationen
+
+Erstellt eine Datenbank mit Schema-Version 1 (ohne Indizes), füllt sie mit
+Stimmen, misst die wichtigsten Abfragen, migriert auf die neueste Version
+und misst erneut.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_migrations.py --votes 1000000
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from migrations import migrate  # noqa: E402
+
+
+QUERIES = {
+    "Ergebnisse (JOIN + GROUP BY)": ("""
+        SELECT c.id, c.name, c.description, COUNT(v.id) as vote_count
+        FROM candidates c LEFT JOIN votes v ON c.id = v.candidate_id
+        GROUP BY c.id ORDER BY vote_count DESC, c.name
+    """, ()),
+    "Kandidat löschen (DELETE votes)": ("DELETE FROM votes WHERE candidate_id = ?", (7,)),
+    "Stimmen eines Clients": ("SELECT id FROM votes WHERE client_id = ?", ("10.1.2.3",)),
+    "Export (ORDER BY timestamp DESC)": ("""
+        SELECT v.id, c.name, v.client_id, v.timestamp
+        FROM votes v JOIN candidates c ON v.candidate_id = c.id
+        ORDER BY v.timestamp DESC
+    """, ()),
+    "Export, erste 100 Zeilen": ("""
+        SELECT v.id, c.name, v.client_id, v.timestamp
+        FROM votes v JOIN candidates c ON v.candidate_id = c.id
+        ORDER BY v.timestamp DESC LIMIT 100
+    """, ()),
+}
+
+
+def populate(conn: sqlite3.Connection, votes: int, candidates: int):
+    """Füllt die Datenbank mit zufälligen Stimmen (reproduzierbar)"""
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO candidates (name, description) VALUES (?, ?)",
+        [(f"Kandidat {i}", "") for i in range(candidates)]
+    )
+    conn.executemany(
+        "INSERT INTO votes (candidate_id, client_id, timestamp) VALUES (?, ?, ?)",
+        (
+            (
+                rng.randint(1, candidates),
+                f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                f"2025-01-01 {rng.randint(8, 20):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+            )
+            for i in range(votes)
+        )
+    )
+    conn.commit()
+
+
+def measure(conn: sqlite3.Connection) -> dict:
+    """Misst Query-Plan und Laufzeit aller Abfragen"""
+    report = {}
+    for label, (sql, params) in QUERIES.items():
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        elapsed = time.perf_counter() - start
+        conn.rollback()  # DELETE nicht übernehmen
+        report[label] = (plan, elapsed)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=1_000_000)
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(str(Path(tmp) / "bench.db"))
+        migrate(conn, target_version=1)
+        populate(conn, args.votes, args.candidates)
+
+        before = measure(conn)
+        start = time.perf_counter()
+        version = migrate(conn)
+        migration_time = time.perf_counter() - start
+        after = measure(conn)
+        conn.close()
+
+    print(f"Stimmen: {args.votes}, Kandidaten: {args.candidates}")
+    print(f"Migration auf Version {version}: {migration_time:.2f} s\n")
+    for label in QUERIES:
+        plan_before, time_before = before[label]
+        plan_after, time_after = after[label]
+        print(f"{label}: {time_before * 1000:.1f} ms -> {time_after * 1000:.1f} ms")
+        print(f"  vorher:  {' | '.join(plan_before)}")
+        print(f"  nachher: {' | '.join(plan_after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Lasttest: Rate-Limiting auf /api/vote und /api/vote/check
+
+Ruft die ASGI-App direkt auf (ohne Netzwerk). Ein missbräuchlicher Client
+schickt in einer Schleife Anfragen (mehrere gleichzeitig), während reguläre
+Wähler je einmal prüfen und abstimmen. Gemessen wird die Latenz der regulären
+Wähler - einmal ohne und einmal mit Rate-Limits - sowie wie viele Anfragen
+des Störers durchkommen.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_rate_limit.py --voters 300 --abuser-concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import asgi_request, client_ip, percentile, temp_api  # noqa: E402
+
+
+async def post(app, path: str, client: str, payload: dict) -> tuple:
+    """Schickt ein POST und wartet auch die Hintergrund-Tasks ab; Returns: (Status, Latenz in s)"""
+    response, task = await asgi_request(app, "POST", path, client, payload)
+    await task
+    return response["status"], response["latency"]
+
+
+async def voter(app, client: str, candidate_id: int) -> float:
+    """Regulärer Wähler: Status prüfen, dann abstimmen; Returns: Gesamtlatenz"""
+    status, check_latency = await post(app, "/api/vote/check", client, {"client_id": client})
+    assert status == 200, status
+    status, vote_latency = await post(app, "/api/vote", client, {"candidate_id": candidate_id})
+    assert status == 200, status
+    return check_latency + vote_latency
+
+
+async def abuser(app, stop: asyncio.Event, statuses: Counter, candidate_id: int):
+    """Störer: prüft und stimmt in einer Schleife ab, immer mit derselben IP"""
+    while not stop.is_set():
+        status, _ = await post(app, "/api/vote/check", "10.99.0.1", {"client_id": "x"})
+        statuses[status] += 1
+        status, _ = await post(app, "/api/vote", "10.99.0.1", {"candidate_id": candidate_id})
+        statuses[status] += 1
+
+
+async def run(app, voters: int, concurrency: int, candidate_ids: list, subnet: int) -> tuple:
+    """Lässt reguläre Wähler gegen den Störer antreten"""
+    stop = asyncio.Event()
+    statuses: Counter = Counter()
+    abusers = [asyncio.create_task(abuser(app, stop, statuses, candidate_ids[0])) for _ in range(concurrency)]
+    # Störer erst richtig in Gang kommen lassen
+    await asyncio.sleep(0.2)
+
+    async def delayed_voter(i: int) -> float:
+        # Wähler kommen nacheinander (alle 2 ms) statt alle auf einmal
+        await asyncio.sleep(i * 0.002)
+        return await voter(app, client_ip((subnet << 16) + i), candidate_ids[i % len(candidate_ids)])
+
+    latencies = await asyncio.gather(*(delayed_voter(i) for i in range(voters)))
+    stop.set()
+    await asyncio.gather(*abusers)
+    return latencies, statuses
+
+
+def report(name: str, latencies: list, statuses: Counter):
+    print(f"  {name:12s} Wähler p50: {percentile(latencies, 0.50) * 1000:7.1f} ms, "
+          f"p99: {percentile(latencies, 0.99) * 1000:7.1f} ms, max: {percentile(latencies, 1.0) * 1000:7.1f} ms   "
+          f"Störer: {statuses[200]} durchgelassen, {statuses[429]} mit 429 abgewiesen")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--voters", type=int, default=300)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--abuser-concurrency", type=int, default=200, help="gleichzeitige Anfragen des Störers")
+    args = parser.parse_args()
+
+    with temp_api(args.candidates) as (api, candidate_ids):
+        limits = dict(api.RATE_LIMITS)
+
+        print(f"Wähler: {args.voters}, Störer mit {args.abuser_concurrency} gleichzeitigen Anfragen")
+        api.RATE_LIMITS.clear()
+        latencies, statuses = asyncio.run(run(api.app, args.voters, args.abuser_concurrency, candidate_ids, 1))
+        report("Ohne Limit", latencies, statuses)
+
+        api.db.unlock_clients()
+        api.RATE_LIMITS.update(limits)
+        latencies, statuses = asyncio.run(run(api.app, args.voters, args.abuser_concurrency, candidate_ids, 2))
+        report("Mit Limit", latencies, statuses)
+        print(f"  Rate-Limits: {json.dumps({path: limiter.get_stats() for path, limiter in limits.items()})}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: Durchsatz der lesenden Endpoints (Response-Cache)
+
+Ruft die ASGI-App direkt auf (ohne Netzwerk, ein Kern) und misst Anfragen
+pro Sekunde für /api/results, /api/candidates, /api/admin/status und
+/api/settings/vote-title - jeweils mit und ohne passendes If-None-Match.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_read_endpoints.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import asgi_request, client_ip, temp_api  # noqa: E402
+
+ENDPOINTS = ["/api/results", "/api/candidates", "/api/admin/status", "/api/settings/vote-title"]
+
+
+async def get(app, path: str, headers: list) -> tuple:
+    """Schickt ein GET direkt an die ASGI-App; Returns: (Status, Header)"""
+    response, task = await asgi_request(app, "GET", path, headers=headers)
+    await task
+    return response["status"], response["headers"]
+
+
+async def measure(app, path: str, requests: int, headers: list) -> float:
+    """Returns: Anfragen pro Sekunde (nacheinander, ein Kern)"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get(app, path, headers)
+    return requests / (time.perf_counter() - start)
+
+
+async def run(app, requests: int):
+    for path in ENDPOINTS:
+        status, headers = await get(app, path, [])
+        assert status == 200, (path, status)
+        cached = await measure(app, path, requests, [])
+        not_modified = await measure(app, path, requests, [(b"if-none-match", headers["etag"].encode())])
+        print(f"  {path:28s} 200: {cached:8.0f} req/s   304: {not_modified:8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args()
+
+    with temp_api(args.candidates) as (api, candidate_ids):
+        for i, candidate_id in enumerate(candidate_ids):
+            api.db.cast_vote(client_ip(i), candidate_id)
+
+        print(f"Anfragen pro Endpoint: {args.requests}, Kandidaten: {args.candidates}")
+        asyncio.run(run(api.app, args.requests))
+        print(f"  Response-Cache: {api.response_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
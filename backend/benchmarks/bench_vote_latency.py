@@ -0,0 +1,74 @@
+"""
+Benchmark: Latenz von POST /api/vote bei vielen gleichzeitigen Wählern
+
+Ruft die ASGI-App direkt auf (ohne Netzwerk) und misst pro Stimme die Zeit
+bis die Antwort vollständig gesendet ist - so wie ein Client sie erlebt.
+Hintergrund-Tasks nach der Antwort (WebSocket-Broadcast) zählen nicht mit.
+Simulierte WebSocket-Zuhörer machen die Kosten eines Broadcasts sichtbar.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_vote_latency.py --voters 500 --listeners 50
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import FakeWebSocket, client_ip, percentile, post_vote, temp_api  # noqa: E402
+
+
+async def run(app, ws_manager, listeners: list, voters: int, candidate_ids: list) -> tuple:
+    """Verbindet die Zuhörer, startet alle Wähler gleichzeitig und sammelt die Latenzen"""
+    for listener in listeners:
+        await ws_manager.connect(listener)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(
+        post_vote(app, client_ip(i), candidate_ids[i % len(candidate_ids)])
+        for i in range(voters)
+    ))
+    wall = time.perf_counter() - start
+    assert all(response["status"] == 200 for response, _ in outcomes)
+    # Hintergrund-Tasks (Broadcasts) abwarten, bevor die Datenbank geschlossen wird
+    await asyncio.gather(*(task for _, task in outcomes))
+    # Writer-Tasks der Zuhörer beenden
+    for listener in listeners:
+        await ws_manager.disconnect(listener)
+    return [response["latency"] for response, _ in outcomes], wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--voters", type=int, default=500)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--listeners", type=int, default=50, help="simulierte WebSocket-Clients")
+    args = parser.parse_args()
+
+    with temp_api(args.candidates) as (api, candidate_ids):
+        # Zuhörer geben wie ein echter Socket bei jeder Nachricht den Event-Loop ab
+        listeners = [FakeWebSocket(delay=0) for _ in range(args.listeners)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, wall = asyncio.run(run(api.app, api.ws_manager, listeners, args.voters, candidate_ids))
+        total_votes = api.db.get_total_votes()
+        dropped = api.ws_manager.dropped_slow
+
+    assert total_votes == args.voters, total_votes
+    print(f"Wähler: {args.voters}, Kandidaten: {args.candidates}, WebSocket-Zuhörer: {args.listeners}")
+    print(f"  Durchsatz: {args.voters / wall:.0f} Stimmen/s")
+    print(f"  Latenz p50: {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p95: {percentile(latencies, 0.95) * 1000:.1f} ms, "
+          f"p99: {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"max: {percentile(latencies, 1.0) * 1000:.1f} ms")
+    print(f"  Wegen voller Warteschlange getrennte Zuhörer: {dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Lasttest: Ansturm auf POST /api/vote ("Jetzt abstimmen!")
+
+Ruft die ASGI-App direkt auf (ohne Netzwerk) und schickt die Stimmen
+gleichmäßig verteilt innerhalb von --ramp Sekunden. Verglichen wird ohne und
+mit Warteraum: angenommene Stimmen sollen schnell bleiben, überzählige sofort
+ein 503 mit Retry-After bekommen, statt dass alle gemeinsam langsam werden.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_vote_surge.py --voters 10000 --ramp 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import client_ip, percentile, post_vote, temp_api  # noqa: E402
+
+
+async def run(app, voters: int, ramp: float, candidate_ids: list, subnet: int) -> list:
+    """Startet die Wähler verteilt über `ramp` Sekunden; Returns: [(Status, Latenz)]"""
+    async def delayed_vote(i: int):
+        await asyncio.sleep(ramp * i / voters)
+        return await post_vote(app, client_ip((subnet << 16) + i), candidate_ids[i % len(candidate_ids)])
+
+    outcomes = await asyncio.gather(*(delayed_vote(i) for i in range(voters)))
+    await asyncio.gather(*(task for _, task in outcomes))
+    return [(response["status"], response["latency"]) for response, _ in outcomes]
+
+
+def report(name: str, outcomes: list):
+    accepted = [latency for status, latency in outcomes if status == 200]
+    rejected = [latency for status, latency in outcomes if status == 503]
+    print(f"  {name:14s} angenommen: {len(accepted):5d} (p50 {percentile(accepted, 0.5) * 1000:7.1f} ms, "
+          f"p99 {percentile(accepted, 0.99) * 1000:7.1f} ms, max {percentile(accepted, 1.0) * 1000:7.1f} ms)   "
+          f"503: {len(rejected):5d} (max {percentile(rejected, 1.0) * 1000:6.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--voters", type=int, default=10_000)
+    parser.add_argument("--ramp", type=float, default=1.0, help="Zeitraum (s), über den die Wähler eintreffen")
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args()
+
+    with temp_api(args.candidates) as (api, candidate_ids):
+        from admission import AdmissionQueue
+
+        admission = api.vote_admission
+
+        print(f"Wähler: {args.voters} innerhalb von {args.ramp:.1f} s")
+        # Ohne Warteraum: unbegrenzt viele gleichzeitig
+        api.vote_admission = AdmissionQueue(max_concurrent=10 ** 9, max_queue=0)
+        report("Ohne Warteraum", asyncio.run(run(api.app, args.voters, args.ramp, candidate_ids, 1)))
+
+        api.db.unlock_clients()
+        api.vote_admission = admission
+        report("Mit Warteraum", asyncio.run(run(api.app, args.voters, args.ramp, candidate_ids, 2)))
+        print(f"  Warteraum: {json.dumps(admission.get_stats())}")
+
+
+if __name__ == "__main__":
+    main()
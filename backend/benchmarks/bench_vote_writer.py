@@ -0,0 +1,64 @@
+"""
+Benchmark: Stimmen-Durchsatz mit und ohne Group-Commit-Writer
+
+Simuliert einen Ansturm vieler gleichzeitiger Stimmabgaben (ein Thread pro
+wartendem HTTP-Request) und vergleicht eine Transaktion pro Stimme mit
+Micro-Batches des VoteWriters.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_vote_writer.py --votes 5000 --concurrency 200
+    python benchmarks/bench_vote_writer.py --synchronous FULL   # fsync pro Commit
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _common import cast_votes  # noqa: E402
+from database import Database  # noqa: E402
+
+
+def run(db: Database, votes: int, concurrency: int, candidates: int = 10) -> float:
+    """Gibt Stimmen von `votes` verschiedenen Clients parallel ab und misst Stimmen/s"""
+    candidate_ids = [db.add_candidate(f"Kandidat {i}") for i in range(candidates)]
+    return cast_votes(db, votes, concurrency, candidate_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-delay", type=float, default=0.002, help="Sekunden")
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"])
+    args = parser.parse_args()
+
+    Database.PRAGMAS = tuple(
+        (pragma, args.synchronous if pragma == "synchronous" else value)
+        for pragma, value in Database.PRAGMAS
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = Database(str(Path(tmp) / "single.db"))
+        before = run(single, args.votes, args.concurrency)
+        single.close()
+
+        batched = Database(str(Path(tmp) / "batched.db"), args.batch_size, args.batch_delay)
+        after = run(batched, args.votes, args.concurrency)
+        stats = batched.vote_writer.get_stats()
+        batched.close()
+
+    print(f"Stimmen: {args.votes}, gleichzeitige Clients: {args.concurrency}, synchronous={args.synchronous}")
+    print(f"  eine Transaktion pro Stimme: {before:10.0f} Stimmen/s")
+    print(f"  Group-Commit:                {after:10.0f} Stimmen/s")
+    print(f"  Faktor:                      {after / before:10.1f}x")
+    print(f"  Ø Batch-Größe: {stats['avg_batch_size']:.1f}, "
+          f"Ø Wartezeit: {stats['avg_vote_delay_ms']:.2f} ms, "
+          f"max. Wartezeit: {stats['max_vote_delay_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
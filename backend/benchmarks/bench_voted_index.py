@@ -0,0 +1,70 @@
+"""
+Benchmark: has_voted über den Client-Index im Speicher vs. SQLite-Abfrage
+
+Füllt die Datenbank mit abgestimmten Clients, misst die Latenz der
+Duplikat-Prüfung und den Speicherverbrauch des Index pro 100k Clients.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_voted_index.py --clients 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _common import client_ip, populate  # noqa: E402
+from database import Database  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        db = Database(db_path)
+        populate(db, args.clients, 1)
+        db.close()
+        ids = [client_ip(i) for i in range(args.clients)]
+
+        tracemalloc.start()
+        db = Database(db_path)
+        index_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        lookups = [ids[i % len(ids)] for i in range(0, args.lookups * 7, 7)]
+
+        start = time.perf_counter()
+        with db.lock.read("has_voted_sql"), db._cursor() as cursor:
+            for client_id in lookups:
+                cursor.execute(
+                    "SELECT 1 FROM round_participants WHERE round_id = ? AND client_id = ?",
+                    (db.get_current_round(), client_id)
+                )
+                cursor.fetchone()
+        sql_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for client_id in lookups:
+            db.has_voted(client_id)
+        index_time = time.perf_counter() - start
+
+        stats = db.get_voted_index_stats()
+        db.close()
+
+    print(f"Clients: {args.clients}, Abfragen: {args.lookups}")
+    print(f"  SQLite (Pool-Verbindung): {sql_time / args.lookups * 1e6:8.2f} µs pro Abfrage")
+    print(f"  Client-Index:             {index_time / args.lookups * 1e6:8.2f} µs pro Abfrage")
+    print(f"  Speicher (getsizeof):     {stats['bytes_per_100k_clients'] / 1024 / 1024:8.2f} MB pro 100k Clients")
+    print(f"  Speicher (tracemalloc, inkl. Startup): {index_memory / args.clients * 100_000 / 1024 / 1024:.2f} MB pro 100k Clients")
+
+
+if __name__ == "__main__":
+    main()
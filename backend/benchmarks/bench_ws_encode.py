@@ -0,0 +1,87 @@
+"""
+Benchmark: CPU-Zeit pro Broadcast bei vielen WebSocket-Verbindungen
+
+Vergleicht Serialisieren pro Verbindung (send_json, wie bisher) mit einmal
+serialisierten Frames (send_text). Gemessen wird die CPU-Zeit des Prozesses
+vom Broadcast bis alle Writer-Tasks gesendet haben. Die simulierten Sockets
+kodieren den Text wie der Server nach UTF-8; das passiert weiterhin pro Socket.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_ws_encode.py --connections 1000 10000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import Delivery, FakeWebSocket, results_message  # noqa: E402
+from websocket_manager import WebSocketManager  # noqa: E402
+
+
+class PerConnectionManager(WebSocketManager):
+    """Bisheriges Verhalten: jede Verbindung serialisiert die Nachricht selbst"""
+
+    @staticmethod
+    def encode(message: dict) -> dict:
+        return message
+
+    @staticmethod
+    async def _send_frame(websocket, frame: dict):
+        await websocket.send_json(frame)
+
+
+async def run(manager_class, connections: int, broadcasts: int, candidates: int) -> dict:
+    """Returns: Median von CPU- und Wanduhrzeit pro Broadcast (in s) und Frame-Größe"""
+    delivery = Delivery()
+    manager = manager_class(max_queue=16)
+    sockets = [FakeWebSocket(delivery=delivery) for _ in range(connections)]
+    for websocket in sockets:
+        await manager.connect(websocket)
+
+    cpu_times, wall_times = [], []
+    for i in range(broadcasts):
+        message = results_message(i, candidates)
+        delivery.expect(connections)
+        cpu, wall = time.process_time(), time.perf_counter()
+        await manager.broadcast(message)
+        await delivery.done.wait()
+        cpu_times.append(time.process_time() - cpu)
+        wall_times.append(time.perf_counter() - wall)
+
+    for websocket in sockets:
+        await manager.disconnect(websocket)
+    return {
+        "cpu": statistics.median(cpu_times),
+        "wall": statistics.median(wall_times),
+        "frame_bytes": len(WebSocketManager.encode(results_message(0, candidates)).encode("utf-8")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--broadcasts", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.broadcasts} Broadcasts, {args.candidates} Kandidaten")
+    print(f"{'Verbindungen':>12s} {'Modus':24s} {'CPU/Broadcast':>14s} {'Dauer':>10s} {'Frame':>8s}")
+    for connections in args.connections:
+        for manager_class, label in ((PerConnectionManager, "pro Verbindung kodiert"),
+                                     (WebSocketManager, "einmal kodiert")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = asyncio.run(run(manager_class, connections, args.broadcasts, args.candidates))
+            print(f"{connections:12d} {label:24s} {result['cpu'] * 1000:12.2f}ms "
+                  f"{result['wall'] * 1000:8.2f}ms {result['frame_bytes']:7d}B")
+
+
+if __name__ == "__main__":
+    main()
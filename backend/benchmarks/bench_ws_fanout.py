@@ -0,0 +1,92 @@
+"""
+Benchmark: WebSocket-Fan-out bei vielen Zuhörern mit einem langsamen Client
+
+Vergleicht das bisherige sequentielle Senden (ein await pro Client unter
+einem Lock) mit dem WebSocketManager (Warteschlange + Writer-Task pro Client).
+Gemessen wird pro Broadcast die Dauer des Aufrufs und die Zeit, bis alle
+schnellen Zuhörer die Nachricht haben. Ein Zuhörer braucht --slow-delay
+Sekunden pro Nachricht (z.B. ein Handy mit schlechtem WLAN).
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/bench_ws_fanout.py --watchers 10 100 1000 5000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import Delivery, FakeWebSocket, results_message  # noqa: E402
+from websocket_manager import WebSocketManager  # noqa: E402
+
+
+async def sequential_broadcast(lock: asyncio.Lock, connections: list, message: dict):
+    """Bisheriges Verhalten: nacheinander senden, während der Lock gehalten wird"""
+    async with lock:
+        for connection in connections:
+            await connection.send_json(message)
+
+
+async def run(mode: str, watchers: int, broadcasts: int, slow_delay: float, max_queue: int, candidates: int) -> dict:
+    """Returns: Median-Dauer des Aufrufs und der Zustellung in s sowie getrennte Clients"""
+    delivery = Delivery()
+    fast = [FakeWebSocket(delay=0, delivery=delivery) for _ in range(watchers - 1)]
+    connections = fast + [FakeWebSocket(delay=slow_delay)]
+
+    manager = WebSocketManager(max_queue=max_queue)
+    lock = asyncio.Lock()
+    if mode == "queue":
+        for connection in connections:
+            await manager.connect(connection)
+
+    call_times, delivery_times = [], []
+    for i in range(broadcasts):
+        message = results_message(i, candidates)
+        delivery.expect(len(fast))
+        start = time.perf_counter()
+        if mode == "queue":
+            await manager.broadcast(message)
+        else:
+            await sequential_broadcast(lock, connections, message)
+        call_times.append(time.perf_counter() - start)
+        await delivery.done.wait()
+        delivery_times.append(time.perf_counter() - start)
+
+    for connection in connections:
+        await manager.disconnect(connection)
+    return {
+        "call": statistics.median(call_times),
+        "delivery": statistics.median(delivery_times),
+        "dropped": manager.dropped_slow,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watchers", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--broadcasts", type=int, default=10)
+    parser.add_argument("--slow-delay", type=float, default=0.1, help="Sendedauer (s) des langsamen Zuhörers")
+    parser.add_argument("--max-queue", type=int, default=1024, help="Warteschlangenlänge pro Client")
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.broadcasts} Broadcasts, ein Zuhörer mit {args.slow_delay * 1000:.0f} ms pro Nachricht")
+    print(f"{'Zuhörer':>8s} {'Modus':12s} {'Aufruf':>12s} {'Zustellung':>12s} {'getrennt':>9s}")
+    for watchers in args.watchers:
+        for mode, label in (("sequential", "sequentiell"), ("queue", "Warteschlange")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = asyncio.run(run(mode, watchers, args.broadcasts, args.slow_delay,
+                                         args.max_queue, args.candidates))
+            print(f"{watchers:8d} {label:12s} {result['call'] * 1000:10.2f}ms "
+                  f"{result['delivery'] * 1000:10.2f}ms {result['dropped']:9d}")
+
+
+if __name__ == "__main__":
+    main()
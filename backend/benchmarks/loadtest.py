@@ -0,0 +1,409 @@
+"""
+Lasttest: Wähler und Live-Ergebnis-Zuschauer gegen die FastAPI-App
+
+Simuliert N Wähler mit eigener IP-Adresse (erst /api/vote/check, dann
+/api/vote; 429/503 werden wie im Frontend nach Retry-After wiederholt) und
+M WebSocket-Zuschauer auf /ws. Gemessen werden Durchsatz, Latenzen
+(p50/p95/p99) und die Verzögerung, mit der neue Stände bei den Zuschauern
+ankommen (Broadcast-Lag: Empfang eines Ergebnis-Updates mit N Stimmen
+minus Antwort auf die N-te angenommene Stimme).
+
+Modi:
+    inprocess  ruft die ASGI-App direkt auf (ohne Netzwerk)
+    localhost  startet uvicorn in einem Thread und verbindet sich über TCP;
+               jeder Wähler nutzt eine eigene Absenderadresse aus 127.0.0.0/8
+               (unter Linux ohne Konfiguration verfügbar)
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/loadtest.py --voters 1000 --watchers 50
+    python benchmarks/loadtest.py --mode localhost --voters 500 --json ergebnis.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from _common import asgi_request, client_ip, percentile, temp_api  # noqa: E402
+
+# Wie im Frontend (api.js): so oft wird eine abgewiesene Anfrage wiederholt
+MAX_RETRIES = 3
+
+
+# === TRANSPORT: IN-PROCESS ===
+
+class InProcessTransport:
+    """Spricht ASGI direkt mit der App"""
+
+    def __init__(self, app, client_ip: str = "127.0.0.1", tasks: Optional[set] = None):
+        self.app = app
+        self.client_ip = client_ip
+        # App-Aufrufe inkl. Hintergrund-Tasks, werden am Ende abgewartet
+        self.tasks = tasks if tasks is not None else set()
+
+    async def open(self, client_ip: str) -> "InProcessTransport":
+        return InProcessTransport(self.app, client_ip, self.tasks)
+
+    async def request(self, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, Dict, bytes]:
+        response, task = await asgi_request(self.app, method, path, self.client_ip, payload)
+        # Hintergrund-Tasks (Broadcasts) laufen weiter, die Antwort ist aber schon da
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return response["status"], response["headers"], response["body"]
+
+    async def close(self):
+        pass
+
+    async def drain(self):
+        """Wartet auf noch laufende App-Aufrufe"""
+        await asyncio.gather(*self.tasks)
+
+    async def websocket(self, path: str) -> "InProcessWebSocket":
+        ws = InProcessWebSocket(self.app, path)
+        await ws.connect()
+        return ws
+
+
+class InProcessWebSocket:
+    """WebSocket-Client über ASGI-Nachrichten"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+
+    async def connect(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "subprotocols": [],
+            "client": ("127.0.0.1", 50001),
+            "server": ("127.0.0.1", 8000),
+        }
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        message = await self._from_app.get()
+        assert message["type"] == "websocket.accept", message
+
+    async def recv(self) -> Optional[str]:
+        """Returns: nächste Textnachricht, None wenn die Verbindung geschlossen wurde"""
+        message = await self._from_app.get()
+        if message["type"] != "websocket.send":
+            return None
+        return message.get("text") or message.get("bytes", b"").decode()
+
+    async def close(self):
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await self._task
+
+
+# === TRANSPORT: LOCALHOST ===
+
+class LocalhostTransport:
+    """Minimaler HTTP/1.1-Client (Keep-Alive) über TCP mit eigener Absenderadresse"""
+
+    def __init__(self, port: int):
+        self.port = port
+
+    async def open(self, client_ip: str) -> "LocalhostTransport":
+        connection = LocalhostTransport(self.port)
+        connection.reader, connection.writer = await asyncio.open_connection(
+            "127.0.0.1", self.port, local_addr=(client_ip, 0)
+        )
+        return connection
+
+    async def request(self, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, Dict, bytes]:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, data
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def drain(self):
+        pass
+
+    async def websocket(self, path: str) -> "LocalhostWebSocket":
+        import websockets
+        ws = LocalhostWebSocket()
+        ws.connection = await websockets.connect(f"ws://127.0.0.1:{self.port}{path}", max_size=None)
+        return ws
+
+
+class LocalhostWebSocket:
+    async def recv(self) -> Optional[str]:
+        try:
+            message = await self.connection.recv()
+        except Exception:
+            return None
+        return message if isinstance(message, str) else message.decode()
+
+    async def close(self):
+        await self.connection.close()
+
+
+def start_server() -> Tuple[object, threading.Thread, int]:
+    """Startet uvicorn mit der App in einem eigenen Thread; Returns: (Server, Thread, Port)"""
+    import uvicorn
+    import api
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # Ohne Lifespan: die Datenbank wird vom Lasttest selbst geschlossen
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn konnte nicht gestartet werden")
+        time.sleep(0.01)
+    return server, thread, port
+
+
+# === SZENARIO ===
+
+def voter_ip(mode: str, index: int) -> str:
+    """Eindeutige Client-IP pro Wähler (localhost: Absenderadresse aus 127.0.0.0/8)"""
+    # +2: 127.0.0.1 ist der Admin
+    return client_ip(index + 2, 127 if mode == "localhost" else 10)
+
+
+async def send_with_retry(connection, method: str, path: str, payload: dict, stats: Dict) -> Tuple[int, float]:
+    """Schickt eine Anfrage und wiederholt sie nach Retry-After; Returns: (Status, Latenz inkl. Wartezeit)"""
+    start = time.perf_counter()
+    for attempt in range(MAX_RETRIES + 1):
+        status, headers, _ = await connection.request(method, path, payload)
+        retry_after = headers.get("retry-after")
+        if status in (429, 503) and retry_after is not None and attempt < MAX_RETRIES:
+            stats["retries"] += 1
+            await asyncio.sleep(float(retry_after) * (1 + random.random()))
+            continue
+        break
+    return status, time.perf_counter() - start
+
+
+async def voter(transport, mode: str, index: int, candidate_ids: List[int], delay: float, stats: Dict):
+    """Ein Wähler: Status prüfen, dann für einen zufälligen Kandidaten abstimmen"""
+    await asyncio.sleep(delay)
+    connection = await transport.open(voter_ip(mode, index))
+    try:
+        status, latency = await send_with_retry(connection, "POST", "/api/vote/check", {}, stats)
+        stats["check_status"][status] += 1
+        stats["check_latency"].append(latency)
+
+        status, latency = await send_with_retry(
+            connection, "POST", "/api/vote", {"candidate_id": random.choice(candidate_ids)}, stats
+        )
+        stats["vote_status"][status] += 1
+        stats["vote_latency"].append(latency)
+        if status == 200:
+            stats["vote_done"].append(time.perf_counter())
+    finally:
+        await connection.close()
+
+
+async def watcher(ws, updates: List[Tuple[float, int]], done: asyncio.Event, last_message: List[float],
+                  received: Counter):
+    """Ein Zuschauer: merkt sich Empfangszeit und Stimmenzahl jedes Ergebnis-Updates sowie die empfangenen Bytes"""
+    while not done.is_set():
+        text = await ws.recv()
+        if text is None:
+            return
+        last_message[0] = time.perf_counter()
+        received["messages"] += 1
+        received["bytes"] += len(text.encode("utf-8"))
+        message = json.loads(text)
+        total = (message.get("data") or {}).get("total_votes")
+        if total is not None:
+            updates.append((time.perf_counter(), total))
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Returns: p50/p95/p99/max in ms"""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    values = sorted(values)
+    return {name: round(percentile(values, p) * 1000, 2)
+            for name, p in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))}
+
+
+async def run(transport, args) -> Dict:
+    admin = await transport.open("127.0.0.1")
+    candidate_ids = []
+    for i in range(args.candidates):
+        _, _, body = await admin.request("POST", "/api/candidates", {"name": f"Kandidat {i}"})
+        candidate_ids.append(json.loads(body)["id"])
+    _, _, body = await admin.request("GET", "/api/results")
+    baseline = json.loads(body)["total_votes"]
+    # Ergebnis-Update für die neuen Kandidaten abwarten, damit es die erste Stimme nicht verzögert
+    await asyncio.sleep(0.5)
+
+    done = asyncio.Event()
+    sockets = [await transport.websocket("/ws") for _ in range(args.watchers)]
+    updates: List[List[Tuple[float, int]]] = [[] for _ in sockets]
+    last_message = [time.perf_counter()]
+    received = Counter()
+    watchers = [
+        asyncio.create_task(watcher(ws, log, done, last_message, received)) for ws, log in zip(sockets, updates)
+    ]
+
+    stats = {
+        "check_status": Counter(), "vote_status": Counter(), "retries": 0,
+        "check_latency": [], "vote_latency": [], "vote_done": [],
+    }
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        voter(transport, args.mode, i, candidate_ids, args.ramp * i / args.voters, stats)
+        for i in range(args.voters)
+    ))
+    wall = time.perf_counter() - start
+
+    # Warten, bis alle Zuschauer den Endstand haben (oder das Zeitlimit abläuft)
+    accepted = len(stats["vote_done"])
+    final_total = baseline + accepted
+    deadline = time.perf_counter() + args.settle
+    while time.perf_counter() < deadline:
+        # Alle auf dem Endstand und keine Broadcasts mehr unterwegs
+        if all(log and log[-1][1] >= final_total for log in updates) and time.perf_counter() - last_message[0] > 0.2:
+            break
+        await asyncio.sleep(0.01)
+    done.set()
+    for ws in sockets:
+        await ws.close()
+    for task in watchers:
+        task.cancel()
+    await admin.close()
+    await transport.drain()
+
+    # Broadcast-Lag: Ankunft eines Stands mit N Stimmen minus Antwort auf die N-te angenommene Stimme
+    committed = sorted(stats["vote_done"])
+    lags = [
+        max(0.0, received - committed[total - baseline - 1])
+        for log in updates for received, total in log
+        if baseline < total <= final_total
+    ]
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "config": {
+            "voters": args.voters, "watchers": args.watchers,
+            "candidates": args.candidates, "ramp_s": args.ramp,
+        },
+        "votes": {
+            "accepted": accepted,
+            "check_status": {str(k): v for k, v in sorted(stats["check_status"].items())},
+            "vote_status": {str(k): v for k, v in sorted(stats["vote_status"].items())},
+            "retries": stats["retries"],
+            "duration_s": round(wall, 3),
+            "throughput_votes_per_s": round(accepted / wall, 1) if wall else None,
+        },
+        "latency_ms": {
+            "check": percentiles(stats["check_latency"]),
+            "vote": percentiles(stats["vote_latency"]),
+        },
+        "broadcast": {
+            "watchers": args.watchers,
+            "updates_received": sum(len(log) for log in updates),
+            "watchers_up_to_date": sum(1 for log in updates if log and log[-1][1] >= final_total),
+            "lag_ms": percentiles(lags),
+            # Nutzdaten der WebSocket-Nachrichten (ohne Frame-Header)
+            "messages_per_watcher": round(received["messages"] / args.watchers, 1) if args.watchers else 0,
+            "bytes_per_watcher": round(received["bytes"] / args.watchers) if args.watchers else 0,
+        },
+    }
+
+
+def print_report(result: Dict):
+    votes, latency, broadcast = result["votes"], result["latency_ms"], result["broadcast"]
+
+    def fmt(p: Dict) -> str:
+        return " ".join(f"{key} {value:.1f} ms" if value is not None else f"{key} -" for key, value in p.items())
+
+    print(f"Modus: {result['mode']}, Wähler: {result['config']['voters']}, Zuschauer: {broadcast['watchers']}")
+    print(f"  Durchsatz: {votes['throughput_votes_per_s']} Stimmen/s ({votes['accepted']} angenommen "
+          f"in {votes['duration_s']} s, Status {votes['vote_status']}, Wiederholungen {votes['retries']})")
+    print(f"  /api/vote/check: {fmt(latency['check'])}")
+    print(f"  /api/vote:       {fmt(latency['vote'])}")
+    print(f"  Broadcast-Lag:   {fmt(broadcast['lag_ms'])} "
+          f"({broadcast['updates_received']} Updates, {broadcast['watchers_up_to_date']}/{broadcast['watchers']} aktuell)")
+    print(f"  WebSocket:       {broadcast['messages_per_watcher']} Nachrichten, "
+          f"{broadcast['bytes_per_watcher'] / 1024:.1f} KiB pro Zuschauer")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "localhost"), default="inprocess")
+    parser.add_argument("--voters", type=int, default=1000)
+    parser.add_argument("--watchers", type=int, default=50, help="WebSocket-Zuschauer auf /ws")
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--ramp", type=float, default=1.0, help="Zeitraum (s), über den die Wähler eintreffen")
+    parser.add_argument("--settle", type=float, default=5.0,
+                        help="maximale Wartezeit (s), bis alle Zuschauer den Endstand haben")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="DATEI", help="Ergebnis als JSON schreiben ('-' für stdout)")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    if args.json and args.json != "-":
+        args.json = os.path.abspath(args.json)
+
+    # Bei JSON auf stdout landen die Ausgaben des Servers auf stderr
+    log_target = sys.stderr if args.json == "-" else sys.stdout
+    with contextlib.redirect_stdout(log_target), temp_api() as (api, _):
+        if args.mode == "localhost":
+            server, thread, port = start_server()
+            try:
+                result = asyncio.run(run(LocalhostTransport(port), args))
+            finally:
+                server.should_exit = True
+                thread.join()
+        else:
+            result = asyncio.run(run(InProcessTransport(api.app), args))
+
+    if args.json == "-":
+        print(json.dumps(result, indent=2))
+        return
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"  JSON gespeichert: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
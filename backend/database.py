@@ -4,131 +4,312 @@ Verwaltet Kandidaten, Stimmen und Client-Status
 """
 
 import sqlite3
-from typing import List, Dict, Optional
+import sys
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
+import secrets
 import threading
 
+from election_archive import ARCHIVED_RESULTS_SQL, ARCHIVED_VOTES_SQL, ElectionArchiver, open_archive
+from migrations import DEFAULT_SETTINGS, migrate
+from rwlock import ReadWriteLock
+from vote_writer import VoteWriter
+
+
+# Abfragen für den Export der laufenden Wahl (Parameter: erste Runde der Wahl)
+EXPORT_RESULTS_SQL = """
+    SELECT
+        c.id as candidate_id,
+        c.name as candidate_name,
+        c.description,
+        COALESCE(t.vote_count, 0) as vote_count
+    FROM candidates c
+    LEFT JOIN candidate_tallies t ON c.id = t.candidate_id
+    ORDER BY vote_count DESC, c.name
+"""
+
+EXPORT_VOTES_SQL = """
+    SELECT
+        v.id as vote_id,
+        v.round_id,
+        c.name as candidate_name,
+        v.client_id,
+        v.timestamp
+    FROM votes v
+    JOIN candidates c ON v.candidate_id = c.id
+    WHERE v.round_id >= ?
+    ORDER BY v.timestamp DESC
+"""
+
+
+class ExportSnapshot:
+    """
+    Lesetransaktion auf einer eigenen Verbindung für den Export
+    Im WAL-Modus sehen Ergebnisse und Stimmen denselben Stand, ohne Schreiber zu blockieren.
+    Die Stimmen werden portionsweise per Cursor gelesen; nach dem Export close() aufrufen.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, results_sql: str, votes_sql: str,
+                 votes_params: tuple = (), batch_size: int = 1000):
+        self._conn = conn
+        self._votes_sql = votes_sql
+        self._votes_params = votes_params
+        self._batch_size = batch_size
+        try:
+            # Die erste Abfrage nach BEGIN legt den Snapshot fest
+            conn.execute("BEGIN")
+            self.results: List[Dict] = [dict(row) for row in conn.execute(results_sql)]
+        except Exception:
+            conn.close()
+            raise
+
+    def __iter__(self) -> Iterator[Dict]:
+        cursor = self._conn.execute(self._votes_sql, self._votes_params)
+        while True:
+            rows = cursor.fetchmany(self._batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+    def close(self):
+        """Beendet die Lesetransaktion und schließt die Verbindung"""
+        try:
+            self._conn.rollback()
+        finally:
+            self._conn.close()
+
 
 class Database:
-    def __init__(self, db_path: str = "poll.db"):
-        """Initialisiert die Datenbank und erstellt Tabellen"""
+    # PRAGMAs für jede Verbindung des Pools
+    # WAL: Leser blockieren Schreiber nicht, Commits brauchen kein fsync der Hauptdatei
+    # synchronous=NORMAL: im WAL-Modus absturzsicher, fsync nur beim Checkpoint
+    PRAGMAS = (
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("cache_size", -16000),       # ~16 MB Page-Cache pro Verbindung
+        ("mmap_size", 268435456),     # 256 MB Memory-Mapped I/O
+        ("temp_store", "MEMORY"),
+        ("busy_timeout", 5000),       # ms, falls ein anderer Prozess schreibt
+    )
+
+    def __init__(self, db_path: str = "poll.db", max_batch_size: int = 1, max_batch_delay: float = 0.002):
+        """
+        Initialisiert die Datenbank und erstellt Tabellen
+        max_batch_size > 1 aktiviert den Group-Commit-Writer für Stimmabgaben
+        """
         self.db_path = db_path
-        self.lock = threading.Lock()
+        # Leser laufen parallel (WAL), Schreiber exklusiv
+        self.lock = ReadWriteLock()
+
+        # Connection-Pool: eine langlebige Verbindung pro Thread
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+
+        # Index der Clients, die in der aktuellen Runde abgestimmt haben
+        # Duplikat-Prüfungen laufen nur gegen dieses Set, nie gegen SQLite
+        self._voted_clients: Set[str] = set()
+        # Kandidaten-Index (id -> Name), wird von den Kandidaten-Methoden gepflegt
+        self._candidate_names: Dict[int, str] = {}
+        self._current_round = 1
+        # Laufende Wahl und ihre erste Runde (ältere Runden gehören zu abgeschlossenen Wahlen)
+        self._current_election = 1
+        self._first_round = 1
+
+        # Datenversion für ETags: jede schreibende Methode erhöht den Zähler,
+        # das Token unterscheidet Server-Starts (der Zähler beginnt wieder bei 0)
+        self._data_version = 0
+        self._data_version_token = secrets.token_hex(4)
+
         self._init_database()
 
-    def _get_connection(self):
-        """Erstellt eine neue Datenbankverbindung"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        # Verschiebt abgeschlossene Wahlen im Hintergrund ins Archiv
+        self.archiver = ElectionArchiver(self)
 
-    def _init_database(self):
-        """Erstellt die Datenbanktabellen falls nicht vorhanden"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        # Optionaler Group-Commit-Writer (mehrere Stimmen pro Transaktion)
+        self.vote_writer: Optional[VoteWriter] = None
+        if max_batch_size > 1:
+            self.vote_writer = VoteWriter(self._cast_vote_batch, max_batch_size, max_batch_delay)
 
-            # Kandidaten-Tabelle
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS candidates (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+    # === CONNECTION-POOL ===
 
-            # Stimmen-Tabelle
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS votes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    candidate_id INTEGER NOT NULL,
-                    client_id TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (candidate_id) REFERENCES candidates(id)
-                )
-            """)
+    def _open_connection(self) -> sqlite3.Connection:
+        """Öffnet eine neue Verbindung und setzt die PRAGMAs"""
+        # check_same_thread=False, damit close() alle Verbindungen schließen kann;
+        # benutzt wird jede Verbindung nur von ihrem eigenen Thread
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma, value in self.PRAGMAS:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
 
-            # Client-Tabelle (verhindert Mehrfachabstimmung)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS clients (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    client_identifier TEXT UNIQUE NOT NULL,
-                    has_voted BOOLEAN DEFAULT FALSE,
-                    last_vote_time TIMESTAMP
-                )
-            """)
+    def _get_connection(self) -> sqlite3.Connection:
+        """Gibt die Verbindung des aktuellen Threads zurück (wird bei Bedarf geöffnet)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Datenbank wurde bereits geschlossen")
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
 
-            # Settings-Tabelle (für konfigurierbare Texte)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-            """)
+    @contextmanager
+    def _cursor(self):
+        """
+        Liefert einen Cursor auf der Verbindung des aktuellen Threads
+        Commit bei Erfolg, Rollback bei Exception
+        """
+        conn = self._get_connection()
+        with conn:
+            yield conn.cursor()
+
+    def close(self):
+        """Schließt alle Verbindungen des Pools (beim Herunterfahren aufrufen)"""
+        # Wartende Stimmen zuerst schreiben
+        if self.vote_writer:
+            self.vote_writer.stop()
+        self.archiver.stop()
+
+        with self.lock.write("close"):
+            with self._pool_lock:
+                if self._closed:
+                    return
+                self._closed = True
+                connections, self._connections = self._connections, []
+
+            for index, conn in enumerate(connections):
+                try:
+                    if index == 0:
+                        # WAL-Datei in die Hauptdatei übernehmen und kürzen
+                        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    conn.close()
+                except sqlite3.Error as e:
+                    print(f"Fehler beim Schließen der Datenbankverbindung: {e}")
 
-            # Setze Standard-Titel falls nicht vorhanden
+    def _init_database(self):
+        """Erstellt bzw. migriert die Datenbanktabellen und prüft die Stimmen-Zähler"""
+        with self.lock.write("_init_database"):
+            migrate(self._get_connection())
+            self._load_current_round()
+            self._load_candidate_names()
+        self.verify_tallies()
+
+    def _bump_data_version(self):
+        """Markiert eine Datenänderung (unter Schreib-Lock nach dem Commit aufrufen)"""
+        self._data_version += 1
+
+    def get_data_version(self) -> str:
+        """Gibt die aktuelle Datenversion zurück (ändert sich bei jeder Schreiboperation)"""
+        return f"{self._data_version_token}-{self._data_version}"
+
+    def _load_candidate_names(self):
+        """Baut den Kandidaten-Index neu auf (unter Schreib-Lock aufrufen)"""
+        with self._cursor() as cursor:
+            cursor.execute("SELECT id, name FROM candidates")
+            self._candidate_names = {row['id']: row['name'] for row in cursor.fetchall()}
+
+    def _load_current_round(self):
+        """Lädt die aktuelle Wahl, Runde und deren Teilnehmer in den Speicher"""
+        with self._cursor() as cursor:
+            cursor.execute("SELECT id, first_round_id FROM elections ORDER BY id DESC LIMIT 1")
+            election = cursor.fetchone()
+            self._current_election = election['id']
+            self._first_round = election['first_round_id']
+
+            cursor.execute("SELECT MAX(id) as round_id FROM rounds")
+            self._current_round = cursor.fetchone()['round_id']
+            if self._current_round is None:
+                cursor.execute("INSERT INTO rounds DEFAULT VALUES")
+                self._current_round = cursor.lastrowid
             cursor.execute(
-                "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
-                ("vote_title", "made with ♥ by @enl1qhtnd")
+                "SELECT client_id FROM round_participants WHERE round_id = ?",
+                (self._current_round,)
             )
+            self._voted_clients = {row['client_id'] for row in cursor.fetchall()}
 
-            conn.commit()
-            conn.close()
+    def reset_database(self):
+        """
+        Setzt die Datenbank komplett zurück (Kandidaten, Stimmen, Einstellungen)
+        Die laufende Wahl wird wie bei reset_votes archiviert, Aufwand O(Kandidaten)
+        """
+        with self.lock.write("reset_database"):
+            with self._cursor() as cursor:
+                self._start_new_election(cursor)
+                cursor.execute("DELETE FROM candidates")
+                cursor.execute("DELETE FROM settings")
+                cursor.executemany(
+                    "INSERT INTO settings (key, value) VALUES (?, ?)",
+                    DEFAULT_SETTINGS.items()
+                )
+            self._load_current_round()
+            self._candidate_names = {}
+            self._bump_data_version()
+        self.archiver.schedule()
 
     # === KANDIDATEN-VERWALTUNG ===
 
     def add_candidate(self, name: str, description: str = "") -> int:
         """Fügt einen neuen Kandidaten hinzu"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO candidates (name, description) VALUES (?, ?)",
-                (name, description)
-            )
-            candidate_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+        with self.lock.write("add_candidate"):
+            with self._cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO candidates (name, description) VALUES (?, ?)",
+                    (name, description)
+                )
+                candidate_id = cursor.lastrowid
+            # Erst nach dem Commit in den Index übernehmen
+            self._candidate_names[candidate_id] = name
+            self._bump_data_version()
             return candidate_id
 
+    def count_candidates(self) -> int:
+        """Gibt die Anzahl der Kandidaten aus dem Index zurück (ohne Datenbankzugriff)"""
+        return len(self._candidate_names)
+
     def get_candidates(self) -> List[Dict]:
         """Gibt alle Kandidaten zurück"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        with self.lock.read("get_candidates"), self._cursor() as cursor:
             cursor.execute("SELECT * FROM candidates ORDER BY name")
             rows = cursor.fetchall()
-            conn.close()
             return [dict(row) for row in rows]
 
     def update_candidate(self, candidate_id: int, name: str, description: str = "") -> bool:
         """Aktualisiert einen Kandidaten"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE candidates SET name = ?, description = ? WHERE id = ?",
-                (name, description, candidate_id)
-            )
-            affected = cursor.rowcount
-            conn.commit()
-            conn.close()
-            return affected > 0
+        with self.lock.write("update_candidate"):
+            with self._cursor() as cursor:
+                cursor.execute(
+                    "UPDATE candidates SET name = ?, description = ? WHERE id = ?",
+                    (name, description, candidate_id)
+                )
+                updated = cursor.rowcount > 0
+            if updated:
+                self._candidate_names[candidate_id] = name
+                self._bump_data_version()
+            return updated
 
     def delete_candidate(self, candidate_id: int) -> bool:
-        """Löscht einen Kandidaten und alle seine Stimmen"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            # Erst Stimmen löschen
-            cursor.execute("DELETE FROM votes WHERE candidate_id = ?", (candidate_id,))
-            # Dann Kandidat löschen
-            cursor.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
-            affected = cursor.rowcount
-            conn.commit()
-            conn.close()
-            return affected > 0
+        """Löscht einen Kandidaten und alle seine Stimmen der laufenden Wahl"""
+        with self.lock.write("delete_candidate"):
+            with self._cursor() as cursor:
+                # Erst Stimmen löschen (abgeschlossene Wahlen bleiben fürs Archiv unverändert)
+                cursor.execute(
+                    "DELETE FROM votes WHERE candidate_id = ? AND round_id >= ?",
+                    (candidate_id, self._first_round)
+                )
+                # Dann Kandidat löschen
+                cursor.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+                deleted = cursor.rowcount > 0
+            self._candidate_names.pop(candidate_id, None)
+            if deleted:
+                self._bump_data_version()
+            return deleted
 
     # === VOTING ===
 
@@ -137,72 +318,118 @@ class Database:
         Gibt eine Stimme ab, wenn der Client noch nicht abgestimmt hat
         Returns: True wenn erfolgreich, False wenn bereits abgestimmt
         """
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Prüfe ob Client bereits abgestimmt hat
-            cursor.execute(
-                "SELECT has_voted FROM clients WHERE client_identifier = ?",
-                (client_id,)
-            )
-            result = cursor.fetchone()
+        if self.vote_writer:
+            return self.vote_writer.submit(client_id, candidate_id).result()
+        return self._cast_vote_batch([(client_id, candidate_id)])[0]
 
-            if result and result['has_voted']:
-                conn.close()
-                return False
+    def submit_vote(self, client_id: str, candidate_id: int) -> Future:
+        """
+        Gibt eine Stimme ab, ohne auf den Commit zu warten
+        Returns: Future mit dem Ergebnis von cast_vote (für async-Aufrufer)
+        """
+        future: Future = Future()
+        if client_id in self._voted_clients or candidate_id not in self._candidate_names:
+            # Duplikat bzw. unbekannten Kandidaten direkt ablehnen, ohne den Writer zu belasten
+            future.set_result(False)
+            return future
 
-            # Prüfe ob Kandidat existiert
-            cursor.execute("SELECT id FROM candidates WHERE id = ?", (candidate_id,))
-            if not cursor.fetchone():
-                conn.close()
-                return False
+        if self.vote_writer:
+            return self.vote_writer.submit(client_id, candidate_id)
 
-            # Stimme registrieren
-            cursor.execute(
-                "INSERT INTO votes (candidate_id, client_id) VALUES (?, ?)",
-                (candidate_id, client_id)
-            )
+        future.set_result(self._cast_vote_batch([(client_id, candidate_id)])[0])
+        return future
 
-            # Client als "hat abgestimmt" markieren
-            if result:
-                cursor.execute(
-                    "UPDATE clients SET has_voted = TRUE, last_vote_time = ? WHERE client_identifier = ?",
-                    (datetime.now(), client_id)
-                )
-            else:
-                cursor.execute(
-                    "INSERT INTO clients (client_identifier, has_voted, last_vote_time) VALUES (?, TRUE, ?)",
-                    (client_id, datetime.now())
-                )
-
-            conn.commit()
-            conn.close()
-            return True
+    def _cast_vote_batch(self, votes: List[Tuple[str, int]]) -> List[bool]:
+        """
+        Schreibt mehrere Stimmen in einer einzigen Transaktion
+        Returns: pro Stimme True wenn gezählt, False wenn abgelehnt
+        """
+        with self.lock.write("cast_vote"):
+            # Clients dieses Batches; erst nach dem Commit in den Index übernehmen
+            batch_voters: Set[str] = set()
+            round_id = self._current_round
+            with self._cursor() as cursor:
+                results = []
+                for client_id, candidate_id in votes:
+                    if client_id in self._voted_clients or client_id in batch_voters:
+                        results.append(False)
+                    elif self._insert_vote(cursor, round_id, client_id, candidate_id):
+                        batch_voters.add(client_id)
+                        results.append(True)
+                    else:
+                        results.append(False)
+
+            self._voted_clients |= batch_voters
+            if batch_voters:
+                self._bump_data_version()
+            return results
+
+    def _insert_vote(self, cursor: sqlite3.Cursor, round_id: int, client_id: str, candidate_id: int) -> bool:
+        """Registriert eine einzelne Stimme innerhalb einer offenen Transaktion"""
+        # Prüfe ob Kandidat existiert (Index ist unter dem Schreib-Lock aktuell)
+        if candidate_id not in self._candidate_names:
+            return False
+
+        # Client als Teilnehmer der Runde markieren (Primärschlüssel sichert 1 Stimme pro Runde ab)
+        cursor.execute(
+            "INSERT OR IGNORE INTO round_participants (round_id, client_id, voted_at) VALUES (?, ?, ?)",
+            (round_id, client_id, datetime.now())
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        # Stimme registrieren
+        cursor.execute(
+            "INSERT INTO votes (candidate_id, client_id, round_id) VALUES (?, ?, ?)",
+            (candidate_id, client_id, round_id)
+        )
+
+        return True
 
     def has_voted(self, client_id: str) -> bool:
-        """Prüft ob ein Client bereits abgestimmt hat"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT has_voted FROM clients WHERE client_identifier = ?",
-                (client_id,)
-            )
-            result = cursor.fetchone()
-            conn.close()
-            return result['has_voted'] if result else False
+        """Prüft ob ein Client bereits abgestimmt hat (O(1), ohne Datenbankzugriff)"""
+        return client_id in self._voted_clients
+
+    def get_voted_index_stats(self) -> Dict:
+        """Gibt Größe und Speicherverbrauch des Client-Index zurück"""
+        voted_clients = self._voted_clients
+        clients = len(voted_clients)
+        # Set-Tabelle plus die gespeicherten Strings
+        memory = sys.getsizeof(voted_clients) + sum(sys.getsizeof(c) for c in list(voted_clients))
+        return {
+            "clients": clients,
+            "memory_bytes": memory,
+            "bytes_per_100k_clients": round(memory / clients * 100_000) if clients else 0
+        }
 
     # === ERGEBNISSE ===
 
-    def get_results(self) -> List[Dict]:
+    def get_results(self, round_id: Optional[int] = None) -> List[Dict]:
         """
-        Gibt die Abstimmungsergebnisse zurück
+        Gibt die Abstimmungsergebnisse der laufenden Wahl zurück (alle Runden oder eine bestimmte Runde)
         Format: [{candidate_id, candidate_name, description, vote_count}]
+        Gesamt-Stimmen kommen aus candidate_tallies (per Trigger gepflegt), Aufwand O(Kandidaten)
         """
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        if round_id is not None:
+            return self._get_round_results(round_id)
+
+        with self.lock.read("get_results"), self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    c.id as candidate_id,
+                    c.name as candidate_name,
+                    c.description,
+                    COALESCE(t.vote_count, 0) as vote_count
+                FROM candidates c
+                LEFT JOIN candidate_tallies t ON c.id = t.candidate_id
+                ORDER BY vote_count DESC, c.name
+            """)
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    def _get_round_results(self, round_id: int) -> List[Dict]:
+        """Ergebnisse einer einzelnen Runde (über den Index auf round_id, candidate_id)"""
+        with self.lock.read("get_results"), self._cursor() as cursor:
             cursor.execute("""
                 SELECT
                     c.id as candidate_id,
@@ -210,90 +437,308 @@ class Database:
                     c.description,
                     COUNT(v.id) as vote_count
                 FROM candidates c
-                LEFT JOIN votes v ON c.id = v.candidate_id
+                LEFT JOIN votes v ON c.id = v.candidate_id AND v.round_id = ?
                 GROUP BY c.id
                 ORDER BY vote_count DESC, c.name
-            """)
+            """, (round_id,))
             rows = cursor.fetchall()
-            conn.close()
             return [dict(row) for row in rows]
 
-    def get_total_votes(self) -> int:
-        """Gibt die Gesamtanzahl der Stimmen zurück"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as total FROM votes")
-            result = cursor.fetchone()
-            conn.close()
-            return result['total'] if result else 0
+    def get_total_votes(self, round_id: Optional[int] = None) -> int:
+        """Gibt die Gesamtanzahl der Stimmen zurück (Summe aus candidate_tallies bzw. einer Runde)"""
+        with self.lock.read("get_total_votes"), self._cursor() as cursor:
+            if round_id is not None:
+                cursor.execute("SELECT COUNT(*) as total FROM votes WHERE round_id = ?", (round_id,))
+            else:
+                cursor.execute("SELECT COALESCE(SUM(vote_count), 0) as total FROM candidate_tallies")
+            return cursor.fetchone()['total']
+
+    # === RUNDEN ===
+
+    def get_current_round(self) -> int:
+        """Gibt die ID der laufenden Abstimmungsrunde zurück"""
+        return self._current_round
+
+    def get_rounds(self) -> List[Dict]:
+        """
+        Gibt alle Runden der laufenden Wahl zurück
+        Format: [{round_id, started_at, vote_count}]
+        """
+        with self.lock.read("get_rounds"), self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    r.id as round_id,
+                    r.started_at,
+                    (SELECT COUNT(*) FROM votes v WHERE v.round_id = r.id) as vote_count
+                FROM rounds r
+                WHERE r.id >= ?
+                ORDER BY r.id
+            """, (self._first_round,))
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    def round_exists(self, round_id: int) -> bool:
+        """Prüft ob eine Runde in der laufenden Wahl existiert"""
+        with self.lock.read("round_exists"), self._cursor() as cursor:
+            cursor.execute("SELECT 1 FROM rounds WHERE id = ? AND id >= ?", (round_id, self._first_round))
+            return cursor.fetchone() is not None
+
+    def verify_tallies(self) -> Dict:
+        """
+        Vergleicht candidate_tallies mit den tatsächlichen Stimmen
+        Baut die Tabelle neu auf, falls die Zähler abweichen
+        Returns: {"consistent": bool, "drifted_candidates": int, "rebuilt": bool}
+        """
+        with self.lock.write("verify_tallies"), self._cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*) as drifted FROM (
+                    SELECT candidate_id
+                    FROM (
+                        SELECT candidate_id, COUNT(*) as actual, 0 as stored
+                        FROM votes WHERE round_id >= :first_round GROUP BY candidate_id
+                        UNION ALL
+                        SELECT candidate_id, 0, vote_count FROM candidate_tallies
+                    )
+                    GROUP BY candidate_id
+                    HAVING SUM(actual) != SUM(stored)
+                )
+            """, {"first_round": self._first_round})
+            drifted = cursor.fetchone()['drifted']
+
+            if drifted:
+                print(f"candidate_tallies weicht bei {drifted} Kandidaten ab - wird neu aufgebaut")
+                cursor.execute("DELETE FROM candidate_tallies")
+                cursor.execute("""
+                    INSERT INTO candidate_tallies (candidate_id, vote_count)
+                    SELECT candidate_id, COUNT(*) FROM votes WHERE round_id >= ? GROUP BY candidate_id
+                """, (self._first_round,))
+                cursor.execute("""
+                    INSERT OR IGNORE INTO candidate_tallies (candidate_id, vote_count)
+                    SELECT id, 0 FROM candidates
+                """)
+                self._bump_data_version()
+
+            return {"consistent": drifted == 0, "drifted_candidates": drifted, "rebuilt": drifted > 0}
 
     # === ADMIN-FUNKTIONEN ===
 
     def reset_votes(self):
-        """Löscht alle Stimmen und setzt Client-Status zurück"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM votes")
-            cursor.execute("UPDATE clients SET has_voted = FALSE, last_vote_time = NULL")
-            conn.commit()
-            conn.close()
+        """
+        Beendet die laufende Wahl und startet eine neue (Kandidaten bleiben erhalten)
+        Die alten Stimmen werden nicht gelöscht, sondern im Hintergrund archiviert;
+        der Reset selbst kostet O(Kandidaten), unabhängig von der Anzahl Stimmen
+        """
+        with self.lock.write("reset_votes"):
+            with self._cursor() as cursor:
+                self._start_new_election(cursor)
+            self._load_current_round()
+            self._bump_data_version()
+        self.archiver.schedule()
+
+    def _start_new_election(self, cursor: sqlite3.Cursor):
+        """Schließt die laufende Wahl ab und beginnt eine neue (unter Schreib-Lock aufrufen)"""
+        election_id = self._current_election
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO election_candidates (election_id, candidate_id, name, description)
+            SELECT ?, id, name, description FROM candidates
+            """,
+            (election_id,)
+        )
+        cursor.execute(
+            """
+            UPDATE elections
+            SET ended_at = ?, vote_count = (SELECT COALESCE(SUM(vote_count), 0) FROM candidate_tallies)
+            WHERE id = ?
+            """,
+            (datetime.now(), election_id)
+        )
+        cursor.execute("INSERT INTO rounds DEFAULT VALUES")
+        cursor.execute("INSERT INTO elections (first_round_id) VALUES (?)", (cursor.lastrowid,))
+        cursor.execute("UPDATE candidate_tallies SET vote_count = 0")
 
     def unlock_clients(self):
         """
         Entsperrt alle Clients für eine neue Abstimmungsrunde
-        WICHTIG: Stimmen bleiben erhalten, nur der Client-Status wird zurückgesetzt
+        WICHTIG: Stimmen bleiben erhalten, es wird nur eine neue Runde gestartet (O(1))
         """
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE clients SET has_voted = FALSE")
-            conn.commit()
-            conn.close()
+        with self.lock.write("unlock_clients"):
+            with self._cursor() as cursor:
+                cursor.execute("INSERT INTO rounds DEFAULT VALUES")
+                round_id = cursor.lastrowid
+            self._current_round = round_id
+            self._voted_clients = set()
+            self._bump_data_version()
+
+    # === WAHLEN UND ARCHIV ===
+
+    def get_elections(self) -> List[Dict]:
+        """
+        Gibt alle Wahlen zurück (die laufende zuletzt)
+        Format: [{election_id, started_at, ended_at, vote_count, archived, current}]
+        """
+        with self.lock.read("get_elections"), self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    id as election_id,
+                    started_at,
+                    ended_at,
+                    COALESCE(vote_count, (SELECT COALESCE(SUM(vote_count), 0) FROM candidate_tallies)) as vote_count,
+                    archived_at IS NOT NULL as archived
+                FROM elections
+                ORDER BY id
+            """)
+            rows = cursor.fetchall()
+        return [
+            dict(row, archived=bool(row['archived']), current=row['election_id'] == self._current_election)
+            for row in rows
+        ]
+
+    def get_election_archive(self, election_id: int) -> Optional[Dict]:
+        """
+        Gibt den Archiv-Status einer abgeschlossenen Wahl zurück
+        Returns: {"election_id", "archive_path"} (archive_path None = Archivierung läuft) oder None
+        """
+        with self.lock.read("get_election_archive"), self._cursor() as cursor:
+            cursor.execute(
+                "SELECT id as election_id, archive_path FROM elections WHERE id = ? AND ended_at IS NOT NULL",
+                (election_id,)
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def open_archive_snapshot(self, archive_path: str) -> ExportSnapshot:
+        """Export-Snapshot einer archivierten Wahl (gleiche Formate wie open_export_snapshot)"""
+        return ExportSnapshot(open_archive(archive_path), ARCHIVED_RESULTS_SQL, ARCHIVED_VOTES_SQL)
+
+    def _get_pending_archives(self) -> List[Dict]:
+        """Abgeschlossene, noch nicht archivierte Wahlen samt Runden-Bereich"""
+        with self.lock.read("archive"), self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    e.id as election_id,
+                    e.started_at,
+                    e.ended_at,
+                    e.first_round_id,
+                    (SELECT MIN(n.first_round_id) FROM elections n WHERE n.id > e.id) as end_round_id
+                FROM elections e
+                WHERE e.ended_at IS NOT NULL AND e.archived_at IS NULL
+                ORDER BY e.id
+            """)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def _get_election_candidates(self, election_id: int) -> List[Tuple]:
+        """Kandidaten einer abgeschlossenen Wahl (Stand beim Reset)"""
+        with self.lock.read("archive"), self._cursor() as cursor:
+            cursor.execute(
+                "SELECT candidate_id, name, description FROM election_candidates WHERE election_id = ?",
+                (election_id,)
+            )
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def _get_election_rounds(self, election: Dict) -> List[Tuple]:
+        """Runden einer abgeschlossenen Wahl"""
+        with self.lock.read("archive"), self._cursor() as cursor:
+            cursor.execute(
+                "SELECT id, started_at FROM rounds WHERE id >= ? AND id < ?",
+                (election['first_round_id'], election['end_round_id'])
+            )
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def _read_archive_chunk(self, election: Dict, limit: int) -> List[Tuple]:
+        """Nächste Portion Stimmen einer abgeschlossenen Wahl (über den Index auf round_id)"""
+        with self.lock.read("archive"), self._cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT v.id, v.round_id, v.candidate_id, ec.name, v.client_id, v.timestamp
+                FROM votes v
+                LEFT JOIN election_candidates ec
+                    ON ec.election_id = ? AND ec.candidate_id = v.candidate_id
+                WHERE v.round_id >= ? AND v.round_id < ?
+                LIMIT ?
+                """,
+                (election['election_id'], election['first_round_id'], election['end_round_id'], limit)
+            )
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def _purge_archived_votes(self, vote_ids: List[int]):
+        """Löscht bereits archivierte Stimmen (Trigger lassen candidate_tallies unverändert)"""
+        with self.lock.write("archive"), self._cursor() as cursor:
+            cursor.executemany("DELETE FROM votes WHERE id = ?", ((vote_id,) for vote_id in vote_ids))
+
+    def _purge_archived_participants(self, election: Dict, limit: int) -> bool:
+        """
+        Löscht eine Portion Rundenteilnehmer einer abgeschlossenen Wahl
+        Returns: True solange noch Zeilen gelöscht wurden
+        """
+        with self.lock.write("archive"), self._cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM round_participants
+                WHERE (round_id, client_id) IN (
+                    SELECT round_id, client_id FROM round_participants
+                    WHERE round_id >= ? AND round_id < ?
+                    LIMIT ?
+                )
+                """,
+                (election['first_round_id'], election['end_round_id'], limit)
+            )
+            return cursor.rowcount > 0
+
+    def _finish_archive(self, election_id: int, archive_path: str):
+        """Markiert eine Wahl als archiviert"""
+        with self.lock.write("archive"), self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE elections SET archive_path = ?, archived_at = ? WHERE id = ?",
+                (archive_path, datetime.now(), election_id)
+            )
+            cursor.execute("DELETE FROM election_candidates WHERE election_id = ?", (election_id,))
 
     # === SETTINGS-VERWALTUNG ===
 
     def get_setting(self, key: str) -> Optional[str]:
         """Liest eine Einstellung aus der Datenbank"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        with self.lock.read("get_setting"), self._cursor() as cursor:
             cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
             result = cursor.fetchone()
-            conn.close()
             return result['value'] if result else None
 
     def set_setting(self, key: str, value: str):
         """Setzt eine Einstellung in der Datenbank"""
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                (key, value)
-            )
-            conn.commit()
-            conn.close()
+        with self.lock.write("set_setting"):
+            with self._cursor() as cursor:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    (key, value)
+                )
+            self._bump_data_version()
+
+    def open_export_snapshot(self) -> ExportSnapshot:
+        """
+        Export-Snapshot der laufenden Wahl auf einer eigenen Verbindung (ohne Lock)
+        results: wie get_results(); Iteration liefert die Stimmen wie get_all_votes_detailed()
+        """
+        return ExportSnapshot(
+            self._open_connection(), EXPORT_RESULTS_SQL, EXPORT_VOTES_SQL, (self._first_round,)
+        )
 
     def get_all_votes_detailed(self) -> List[Dict]:
         """
-        Gibt alle Stimmen mit Details zurück (für Excel-Export)
-        Format: [{vote_id, candidate_name, client_id, timestamp}]
+        Gibt alle Stimmen der laufenden Wahl mit Details zurück (für Excel-Export)
+        Format: [{vote_id, round_id, candidate_name, client_id, timestamp}]
         """
-        with self.lock:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        with self.lock.read("get_all_votes_detailed"), self._cursor() as cursor:
             cursor.execute("""
                 SELECT
                     v.id as vote_id,
+                    v.round_id,
                     c.name as candidate_name,
                     v.client_id,
                     v.timestamp
                 FROM votes v
                 JOIN candidates c ON v.candidate_id = c.id
+                WHERE v.round_id >= ?
                 ORDER BY v.timestamp DESC
-            """)
+            """, (self._first_round,))
             rows = cursor.fetchall()
-            conn.close()
             return [dict(row) for row in rows]
@@ -0,0 +1,183 @@
+"""
+Archivierung abgeschlossener Wahlen
+Nach einem Reset verschiebt ein Hintergrund-Thread die Stimmen der alten Wahl
+in kleinen Portionen in eine eigene Archiv-Datenbank (poll_wahl_<id>.db).
+Der Reset selbst muss so keine Stimmen löschen; die alte Wahl bleibt exportierbar.
+"""
+
+from typing import Dict
+import os
+import sqlite3
+import threading
+
+
+def archive_path_for(db_path: str, election_id: int) -> str:
+    """Pfad der Archiv-Datei einer Wahl (neben der Hauptdatenbank)"""
+    return f"{os.path.splitext(db_path)[0]}_wahl_{election_id}.db"
+
+
+def _create_archive_tables(conn: sqlite3.Connection):
+    """Legt das Schema der Archiv-Datei an"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS election (
+            id INTEGER PRIMARY KEY,
+            started_at TIMESTAMP,
+            ended_at TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rounds (
+            id INTEGER PRIMARY KEY,
+            started_at TIMESTAMP
+        )
+    """)
+    # Kandidatenname wird mitgespeichert, damit das Archiv eigenständig lesbar bleibt
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS votes (
+            id INTEGER PRIMARY KEY,
+            round_id INTEGER NOT NULL,
+            candidate_id INTEGER NOT NULL,
+            candidate_name TEXT,
+            client_id TEXT NOT NULL,
+            timestamp TIMESTAMP
+        )
+    """)
+    # Export liest die Stimmen nach Zeit sortiert, ohne sie zu sortieren
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_votes_timestamp ON votes (timestamp)")
+
+
+# Abfragen auf eine Archiv-Datei (gleiche Formate wie get_results / get_all_votes_detailed)
+ARCHIVED_RESULTS_SQL = """
+    SELECT
+        c.id as candidate_id,
+        c.name as candidate_name,
+        c.description,
+        COUNT(v.id) as vote_count
+    FROM candidates c
+    LEFT JOIN votes v ON c.id = v.candidate_id
+    GROUP BY c.id
+    ORDER BY vote_count DESC, c.name
+"""
+
+ARCHIVED_VOTES_SQL = """
+    SELECT id as vote_id, round_id, candidate_name, client_id, timestamp
+    FROM votes
+    ORDER BY timestamp DESC
+"""
+
+
+def open_archive(path: str) -> sqlite3.Connection:
+    """Öffnet eine Archiv-Datei nur zum Lesen"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ElectionArchiver:
+    def __init__(self, db, chunk_size: int = 1000):
+        """
+        Startet den Archiv-Thread und arbeitet liegengebliebene Wahlen ab
+
+        db: der Datenbank-Manager (liefert und löscht die Stimmen alter Wahlen)
+        chunk_size: Stimmen pro Portion; jede Portion hält den Schreib-Lock nur kurz
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+
+        self._wake = threading.Event()
+        self._stopped = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self._thread = threading.Thread(target=self._run, name="election-archiver", daemon=True)
+        self._thread.start()
+        self.schedule()
+
+    def schedule(self):
+        """Weckt den Archiv-Thread (nach jedem Reset aufrufen)"""
+        self._idle.clear()
+        self._wake.set()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Wartet, bis alle abgeschlossenen Wahlen archiviert sind"""
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        """Beendet den Archiv-Thread; eine angefangene Wahl wird beim nächsten Start fortgesetzt"""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+        """Archiv-Schleife: wartet auf abgeschlossene Wahlen und verschiebt sie"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                break
+            try:
+                for election in self.db._get_pending_archives():
+                    if self._stopped:
+                        break
+                    self._archive(election)
+            except Exception as e:
+                print(f"Fehler beim Archivieren einer Wahl: {e}")
+            if not self._wake.is_set():
+                self._idle.set()
+
+    def _archive(self, election: Dict):
+        """Kopiert eine Wahl portionsweise ins Archiv und entfernt sie aus der Hauptdatenbank"""
+        election_id = election['election_id']
+        path = archive_path_for(self.db.db_path, election_id)
+
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with conn:
+                _create_archive_tables(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO election (id, started_at, ended_at) VALUES (?, ?, ?)",
+                    (election_id, election['started_at'], election['ended_at'])
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO candidates (id, name, description) VALUES (?, ?, ?)",
+                    self.db._get_election_candidates(election_id)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rounds (id, started_at) VALUES (?, ?)",
+                    self.db._get_election_rounds(election)
+                )
+
+            while not self._stopped:
+                votes = self.db._read_archive_chunk(election, self.chunk_size)
+                if not votes:
+                    break
+                # Erst im Archiv committen, dann in der Hauptdatenbank löschen;
+                # nach einem Absturz wird die Portion einfach erneut kopiert
+                with conn:
+                    conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO votes (id, round_id, candidate_id, candidate_name, client_id, timestamp)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        votes
+                    )
+                self.db._purge_archived_votes([vote[0] for vote in votes])
+
+            while not self._stopped and self.db._purge_archived_participants(election, self.chunk_size):
+                pass
+
+            if not self._stopped:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.db._finish_archive(election_id, path)
+                print(f"Wahl {election_id} archiviert: {path}")
+        finally:
+            conn.close()
@@ -0,0 +1,162 @@
+"""
+Streaming-Excel-Export
+Schreibt die Arbeitsmappe im write-only-Modus von openpyxl Zeile für Zeile
+aus einem Cursor-Generator und reicht die fertigen Bytes in Portionen weiter.
+Weder die Stimmen noch die Datei liegen dabei vollständig im Speicher.
+"""
+
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+import queue
+import threading
+import time
+
+from openpyxl import Workbook
+
+from metrics import Histogram
+
+
+EXPORT_SECONDS = Histogram(
+    "easywahl_export_duration_seconds", "Dauer eines Excel-Exports", labels=("mode", "status"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+
+
+# Markiert das Ende des Byte-Streams
+_DONE = object()
+
+
+def write_workbook(fileobj: BinaryIO, results: List[Dict], votes: Iterable[Dict]):
+    """
+    Schreibt die Export-Arbeitsmappe in ein (auch nicht seekbares) Dateiobjekt
+
+    results: Zusammenfassung pro Kandidat (Format wie get_results)
+    votes: Stimmen als Iterator (Format wie get_all_votes_detailed), wird nur einmal durchlaufen
+    """
+    wb = Workbook(write_only=True)
+
+    # Sheet 1: Zusammenfassung
+    ws_summary = wb.create_sheet("Zusammenfassung")
+    ws_summary.append(["Kandidat", "Beschreibung", "Stimmen", "Prozent"])
+
+    # Berechne Gesamtstimmen für Prozentberechnung
+    total_votes = sum(result['vote_count'] for result in results)
+
+    for result in results:
+        # Berechne Prozentsatz (mit Schutz vor Division durch Null)
+        percentage = (result['vote_count'] / total_votes * 100) if total_votes > 0 else 0
+
+        ws_summary.append([
+            result['candidate_name'],
+            result.get('description', ''),
+            result['vote_count'],
+            f"{percentage:.2f}%"
+        ])
+
+    # Sheet 2: Detaillierte Votes
+    ws_details = wb.create_sheet("Detaillierte Votes")
+    ws_details.append(["Vote ID", "Runde", "Kandidat", "Client ID", "Zeitstempel"])
+
+    for vote in votes:
+        ws_details.append([
+            vote['vote_id'],
+            vote['round_id'],
+            vote['candidate_name'],
+            vote['client_id'],
+            vote['timestamp']
+        ])
+
+    wb.save(fileobj)
+
+
+class _QueueWriter:
+    """Dateiobjekt, das geschriebene Bytes in eine begrenzte Queue legt (Backpressure)"""
+
+    def __init__(self, chunks: "queue.Queue", cancelled: threading.Event, chunk_size: int):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _put(self, item):
+        # Wartet, solange der Client nicht hinterherkommt; bricht ab, wenn er weg ist
+        while True:
+            if self._cancelled.is_set():
+                raise ConnectionAbortedError("Export abgebrochen")
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def stream_workbook(
+    results: List[Dict],
+    votes: Iterable[Dict],
+    chunk_size: int = 64 * 1024,
+    max_chunks: int = 16
+) -> Iterator[bytes]:
+    """
+    Erzeugt die Arbeitsmappe in einem eigenen Thread und liefert sie als Byte-Portionen
+    Höchstens max_chunks Portionen warten im Speicher; bricht der Verbraucher ab,
+    wird auch das Schreiben beendet.
+    """
+    chunks: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+    cancelled = threading.Event()
+    writer = _QueueWriter(chunks, cancelled, chunk_size)
+
+    def produce():
+        start = time.perf_counter()
+        status = "failed"
+        try:
+            write_workbook(writer, results, votes)
+            writer.flush()
+            writer._put(_DONE)
+            status = "done"
+        except ConnectionAbortedError:
+            status = "aborted"
+        except Exception as e:
+            print(f"Fehler beim Excel-Export: {e}")
+            try:
+                writer._put(e)
+            except ConnectionAbortedError:
+                pass
+        finally:
+            EXPORT_SECONDS.labels("stream", status).observe(time.perf_counter() - start)
+            # Gibt die Datenbankverbindung des Cursor-Generators frei
+            close = getattr(votes, "close", None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, name="excel-export", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+        thread.join()
@@ -0,0 +1,196 @@
+"""
+Export-Jobs für den Excel-Export
+Ein Job erstellt die Datei im Hintergrund (Worker-Pool); Fortschritt und
+Download laufen über eigene Endpoints. Fertige Dateien werden pro Quelle
+(laufende Wahl bzw. archivierte Wahl) und Datenversion wiederverwendet.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+from excel_export import EXPORT_SECONDS, write_workbook
+
+
+class _CountingIterator:
+    """Zählt die gelesenen Stimmen mit (für die Fortschrittsanzeige)"""
+
+    def __init__(self, votes: Iterable[Dict], job: Dict):
+        self._votes = votes
+        self._job = job
+
+    def __iter__(self) -> Iterator[Dict]:
+        for vote in self._votes:
+            self._job["rows_written"] += 1
+            yield vote
+
+
+class ExportJobManager:
+    def __init__(self, db, max_workers: int = 2, max_jobs: int = 50):
+        """
+        db: der Datenbank-Manager (liefert Snapshots und Datenversion)
+        max_workers: parallel laufende Exporte
+        max_jobs: so viele Jobs bleiben abrufbar, ältere werden vergessen
+        """
+        self.db = db
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._artifact_dir = tempfile.mkdtemp(prefix="easywahl-export-")
+        # Löscht die Export-Dateien spätestens beim Beenden des Prozesses, auch wenn close() nie läuft
+        self._remove_artifacts = weakref.finalize(self, shutil.rmtree, self._artifact_dir, ignore_errors=True)
+        self._lock = threading.Lock()
+
+        # Job-ID -> Job (Einfügereihenfolge = Alter)
+        self._jobs: Dict[str, Dict] = {}
+        # Quelle -> (Datenversion, Job-ID) des neuesten Jobs
+        self._latest: Dict[str, Tuple[str, str]] = {}
+
+        self.reused = 0
+        self.built = 0
+
+    def start(self, election_id: Optional[int] = None, archive_path: Optional[str] = None) -> Dict:
+        """
+        Startet einen Export (oder gibt einen passenden laufenden bzw. fertigen Job zurück)
+        election_id/archive_path: archivierte Wahl; ohne Angabe die laufende Wahl
+        """
+        if archive_path:
+            # Archive ändern sich nicht mehr
+            source, version = f"wahl:{election_id}", "archiv"
+        else:
+            source, version = "aktuell", self.db.get_data_version()
+
+        with self._lock:
+            latest = self._latest.get(source)
+            if latest and latest[0] == version:
+                job = self._jobs.get(latest[1])
+                if job and job["status"] in ("queued", "running", "done"):
+                    if job["status"] == "done":
+                        self.reused += 1
+                    return self._public(job)
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if election_id is not None:
+                filename = f"abstimmung_ergebnisse_wahl_{election_id}_{timestamp}.xlsx"
+            else:
+                filename = f"abstimmung_ergebnisse_{timestamp}.xlsx"
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "status": "queued",
+                "election_id": election_id,
+                "data_version": version,
+                "filename": filename,
+                "rows_written": 0,
+                "total_rows": None,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "finished_at": None,
+                "error": None,
+                "source": source,
+                "path": None,
+            }
+            self._jobs[job["job_id"]] = job
+            superseded = self._latest.get(source)
+            self._latest[source] = (version, job["job_id"])
+            self._forget_old_jobs()
+
+        if superseded:
+            self._discard_artifact(superseded[1])
+        self._executor.submit(self._run, job, archive_path)
+        return self._public(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Gibt den Status eines Jobs zurück (None wenn unbekannt)"""
+        job = self._jobs.get(job_id)
+        return self._public(job) if job else None
+
+    def get_artifact(self, job_id: str) -> Optional[Tuple[str, str]]:
+        """Returns: (Dateipfad, Dateiname) eines fertigen Jobs, sonst None"""
+        job = self._jobs.get(job_id)
+        if job and job["status"] == "done" and job["path"] and os.path.exists(job["path"]):
+            return job["path"], job["filename"]
+        return None
+
+    def get_stats(self) -> Dict:
+        """Gibt Anzahl der Jobs und Wiederverwendungen zurück"""
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {
+            "jobs": len(statuses),
+            "running": statuses.count("running") + statuses.count("queued"),
+            "built": self.built,
+            "reused": self.reused,
+        }
+
+    def close(self):
+        """Beendet den Worker-Pool und löscht alle Export-Dateien"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._remove_artifacts()
+
+    def _run(self, job: Dict, archive_path: Optional[str]):
+        """Erstellt die Datei eines Jobs (läuft im Worker-Pool)"""
+        job["status"] = "running"
+        start = time.perf_counter()
+        path = os.path.join(self._artifact_dir, f"{job['job_id']}.xlsx")
+        try:
+            if archive_path:
+                snapshot = self.db.open_archive_snapshot(archive_path)
+            else:
+                snapshot = self.db.open_export_snapshot()
+            try:
+                job["total_rows"] = sum(result["vote_count"] for result in snapshot.results)
+                # Erst vollständig schreiben, dann umbenennen: Downloads sehen nie eine halbe Datei
+                with open(path + ".part", "wb") as f:
+                    write_workbook(f, snapshot.results, _CountingIterator(snapshot, job))
+                os.replace(path + ".part", path)
+            finally:
+                snapshot.close()
+        except Exception as e:
+            print(f"Fehler beim Export-Job {job['job_id']}: {e}")
+            job["error"] = str(e)
+            job["status"] = "failed"
+            if os.path.exists(path + ".part"):
+                os.remove(path + ".part")
+        else:
+            with self._lock:
+                job["path"] = path
+                job["status"] = "done"
+                self.built += 1
+                superseded = self._latest.get(job["source"], (None, None))[1] != job["job_id"]
+            if superseded:
+                # Während des Exports wurde bereits ein neuerer Job gestartet
+                self._discard_artifact(job["job_id"])
+        job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        EXPORT_SECONDS.labels("job", job["status"]).observe(time.perf_counter() - start)
+
+    def _discard_artifact(self, job_id: str):
+        """Löscht die Datei eines überholten Jobs"""
+        job = self._jobs.get(job_id)
+        if job and job["path"]:
+            try:
+                os.remove(job["path"])
+            except OSError:
+                # z.B. unter Windows während eines Downloads; wird bei close() entfernt
+                pass
+            job["path"] = None
+            job["status"] = "expired"
+
+    def _forget_old_jobs(self):
+        """Begrenzt die Anzahl gespeicherter Jobs (unter self._lock aufrufen)"""
+        current = {job_id for _, job_id in self._latest.values()}
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if job_id not in current:
+                del self._jobs[job_id]
+
+    @staticmethod
+    def _public(job: Dict) -> Dict:
+        """Job ohne interne Felder (Quelle, Dateipfad)"""
+        return {key: value for key, value in job.items() if key not in ("source", "path")}
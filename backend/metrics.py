@@ -0,0 +1,258 @@
+"""
+Instrumentierung im Prometheus-Textformat
+Counter, Gauges und Histogramme für die heißen Pfade. Eine Messung kostet
+einen kurzen Lock und (bei Histogrammen) eine binäre Suche; ausgewertet
+wird erst beim Abruf von /metrics.
+Metriken melden sich standardmäßig beim globalen Registry an; Collector-
+Funktionen liefern zusätzlich Werte, die erst beim Abruf berechnet werden.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import threading
+
+
+# Standard-Buckets (Sekunden) für Latenzen von Anfragen
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Feinere Buckets für kurze Vorgänge (Lock-Wartezeiten, Datenbankaufrufe)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Collector: liefert (Name, Typ, Hilfetext, [(Labels, Wert)])
+Sample = Tuple[Dict[str, str], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+_metrics: List["_Metric"] = []
+_collectors: List[Collector] = []
+_registry_lock = threading.Lock()
+
+
+def register(*metrics: "_Metric"):
+    """Meldet Metriken an, die mit register=False erzeugt wurden"""
+    _add(metrics)
+
+
+def _add(metrics: Iterable["_Metric"]):
+    with _registry_lock:
+        for metric in metrics:
+            if metric not in _metrics:
+                _metrics.append(metric)
+
+
+def register_collector(collector: Collector):
+    """Meldet eine Funktion an, die beim Abruf zusätzliche Werte liefert"""
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), register: bool = True):
+        """
+        name: Metrikname (z.B. easywahl_votes_total)
+        documentation: Hilfetext für # HELP
+        labels: Namen der Labels; Werte werden über labels(...) gesetzt
+        register: beim globalen Registry anmelden
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        # Schneller Zugriff über die unveränderten Label-Werte (z.B. Statuscode als int)
+        self._lookup: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        self._default = None if self.label_names else self.labels()
+        if register:
+            _add((self,))
+
+    def labels(self, *values):
+        """Gibt die Zeitreihe für die angegebenen Label-Werte zurück"""
+        child = self._lookup.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} erwartet Labels {self.label_names}")
+            key = tuple(str(value) for value in values)
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+                self._lookup[values] = child
+        return child
+
+    def children(self) -> List[Tuple[Dict[str, str], object]]:
+        """Alle Zeitreihen mit ihren Labels"""
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.label_names, key)), child) for key, child in items]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class _Value:
+    """Ein Zahlenwert (Zeitreihe eines Counters bzw. Gauges)"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Wert wird erst beim Abruf berechnet"""
+        self._function = function
+
+    def get(self) -> float:
+        return self._function() if self._function else self.value
+
+
+class Counter(_Metric):
+    """Nur steigender Zähler"""
+    type = "counter"
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def _new_child(self):
+        return _Value()
+
+    def _samples(self):
+        return [(self.name, labels, child.get()) for labels, child in self.children()]
+
+
+class Gauge(_Metric):
+    """Momentaufnahme, die steigen und fallen kann"""
+    type = "gauge"
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.set_function(function)
+
+    def _new_child(self):
+        return _Value()
+
+    def _samples(self):
+        return [(self.name, labels, child.get()) for labels, child in self.children()]
+
+
+class _HistogramValue:
+    """Verteilung einer Zeitreihe (kumulative Buckets erst beim Abruf)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> Tuple[List[int], int, float, float]:
+        """Returns: (Anzahl pro Bucket, Anzahl, Summe, Maximum) in einem konsistenten Stand"""
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+
+class Histogram(_Metric):
+    """Verteilung von Messwerten (z.B. Latenzen in Sekunden)"""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, register: bool = True):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels, register)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _samples(self):
+        samples = []
+        for labels, child in self.children():
+            counts, count, total, _ = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int):
+        return str(value)
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{label_text}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def render() -> str:
+    """Gibt alle Metriken im Prometheus-Textformat (Version 0.0.4) zurück"""
+    with _registry_lock:
+        metrics = list(_metrics)
+        collectors = list(_collectors)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(_format_sample(name, labels, value) for name, labels, value in metric._samples())
+
+    for collector in collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            print(f"Fehler im Metrik-Collector {collector.__name__}: {e}")
+            continue
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(_format_sample(name, labels, value) for labels, value in samples)
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,284 @@
+"""
+Versionierte Schema-Migrationen für die Poll-Datenbank
+Die aktuelle Version steht in der Tabelle schema_version; bestehende
+poll.db-Dateien werden beim Start in-place aktualisiert
+"""
+
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+
+# Standardwerte der Settings-Tabelle (auch für reset_database)
+DEFAULT_SETTINGS = {
+    "vote_title": "made with ♥ by @enl1qhtnd",
+}
+
+
+# === MIGRATIONEN ===
+
+def _v1_base_tables(cursor: sqlite3.Cursor):
+    """Basistabellen (entspricht dem Schema vor der Versionierung)"""
+    # Kandidaten-Tabelle
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Stimmen-Tabelle
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS votes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            candidate_id INTEGER NOT NULL,
+            client_id TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (candidate_id) REFERENCES candidates(id)
+        )
+    """)
+
+    # Client-Tabelle (verhindert Mehrfachabstimmung)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client_identifier TEXT UNIQUE NOT NULL,
+            has_voted BOOLEAN DEFAULT FALSE,
+            last_vote_time TIMESTAMP
+        )
+    """)
+
+    # Settings-Tabelle (für konfigurierbare Texte)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+
+    # Setze Standard-Titel falls nicht vorhanden
+    cursor.executemany(
+        "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
+        DEFAULT_SETTINGS.items()
+    )
+
+
+def _v2_vote_indexes(cursor: sqlite3.Cursor):
+    """Indizes für Ergebnis-Join, Kandidat löschen, Client-Abfragen und Export-Sortierung"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_votes_candidate_id ON votes (candidate_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_votes_client_id ON votes (client_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_votes_timestamp ON votes (timestamp)")
+    # clients.client_identifier ist bereits durch UNIQUE indiziert
+    cursor.execute("ANALYZE")
+
+
+def _v3_candidate_tallies(cursor: sqlite3.Cursor):
+    """Materialisierte Stimmen-Zähler pro Kandidat, von Triggern auf votes gepflegt"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS candidate_tallies (
+            candidate_id INTEGER PRIMARY KEY,
+            vote_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Bestehende Stimmen übernehmen
+    cursor.execute("""
+        INSERT OR REPLACE INTO candidate_tallies (candidate_id, vote_count)
+        SELECT candidate_id, COUNT(*) FROM votes GROUP BY candidate_id
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO candidate_tallies (candidate_id, vote_count)
+        SELECT id, 0 FROM candidates
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_votes_insert AFTER INSERT ON votes
+        BEGIN
+            INSERT INTO candidate_tallies (candidate_id, vote_count) VALUES (NEW.candidate_id, 1)
+            ON CONFLICT (candidate_id) DO UPDATE SET vote_count = vote_count + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_votes_delete AFTER DELETE ON votes
+        BEGIN
+            UPDATE candidate_tallies SET vote_count = vote_count - 1
+            WHERE candidate_id = OLD.candidate_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_votes_update AFTER UPDATE OF candidate_id ON votes
+        WHEN OLD.candidate_id != NEW.candidate_id
+        BEGIN
+            UPDATE candidate_tallies SET vote_count = vote_count - 1
+            WHERE candidate_id = OLD.candidate_id;
+            INSERT INTO candidate_tallies (candidate_id, vote_count) VALUES (NEW.candidate_id, 1)
+            ON CONFLICT (candidate_id) DO UPDATE SET vote_count = vote_count + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_insert AFTER INSERT ON candidates
+        BEGIN
+            INSERT OR IGNORE INTO candidate_tallies (candidate_id, vote_count) VALUES (NEW.id, 0);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_delete AFTER DELETE ON candidates
+        BEGIN
+            DELETE FROM candidate_tallies WHERE candidate_id = OLD.id;
+        END
+    """)
+
+
+def _v4_rounds(cursor: sqlite3.Cursor):
+    """
+    Abstimmungsrunden: Stimmen und Teilnahme pro (round_id, client_id)
+    Eine neue Runde ist ein einzelnes INSERT; clients.has_voted wird nicht mehr gepflegt
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rounds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Bisherige Stimmen gehören zur ersten Runde
+    cursor.execute("INSERT OR IGNORE INTO rounds (id) VALUES (1)")
+
+    cursor.execute("ALTER TABLE votes ADD COLUMN round_id INTEGER NOT NULL DEFAULT 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_votes_round_candidate ON votes (round_id, candidate_id)")
+
+    # Teilnahme pro Runde (verhindert Mehrfachabstimmung)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS round_participants (
+            round_id INTEGER NOT NULL,
+            client_id TEXT NOT NULL,
+            voted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (round_id, client_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO round_participants (round_id, client_id, voted_at)
+        SELECT 1, client_identifier, COALESCE(last_vote_time, CURRENT_TIMESTAMP)
+        FROM clients WHERE has_voted
+    """)
+
+
+def _v5_elections(cursor: sqlite3.Cursor):
+    """
+    Wahlen als Generationen von Runden: ein Reset beginnt eine neue Wahl,
+    die Stimmen der alten werden im Hintergrund archiviert statt gelöscht
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS elections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_round_id INTEGER NOT NULL,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ended_at TIMESTAMP,
+            vote_count INTEGER,
+            archive_path TEXT,
+            archived_at TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO elections (id, first_round_id)
+        VALUES (1, COALESCE((SELECT MIN(id) FROM rounds), 1))
+    """)
+
+    # Kandidaten beim Ende einer Wahl, damit das Archiv die Namen kennt
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS election_candidates (
+            election_id INTEGER NOT NULL,
+            candidate_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            PRIMARY KEY (election_id, candidate_id)
+        ) WITHOUT ROWID
+    """)
+
+    # Nur Stimmen der laufenden Wahl verändern candidate_tallies
+    # (das Archivieren alter Stimmen darf die Zähler nicht verringern)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_votes_delete")
+    cursor.execute("DROP TRIGGER IF EXISTS trg_votes_update")
+    cursor.execute("""
+        CREATE TRIGGER trg_votes_delete AFTER DELETE ON votes
+        WHEN OLD.round_id >= (SELECT MAX(first_round_id) FROM elections)
+        BEGIN
+            UPDATE candidate_tallies SET vote_count = vote_count - 1
+            WHERE candidate_id = OLD.candidate_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_votes_update AFTER UPDATE OF candidate_id ON votes
+        WHEN OLD.candidate_id != NEW.candidate_id
+            AND OLD.round_id >= (SELECT MAX(first_round_id) FROM elections)
+        BEGIN
+            UPDATE candidate_tallies SET vote_count = vote_count - 1
+            WHERE candidate_id = OLD.candidate_id;
+            INSERT INTO candidate_tallies (candidate_id, vote_count) VALUES (NEW.candidate_id, 1)
+            ON CONFLICT (candidate_id) DO UPDATE SET vote_count = vote_count + 1;
+        END
+    """)
+
+
+# (Version, Beschreibung, Upgrade-Funktion) - nur anhängen, nie ändern
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "Basistabellen", _v1_base_tables),
+    (2, "Indizes auf votes", _v2_vote_indexes),
+    (3, "Materialisierte Tabelle candidate_tallies", _v3_candidate_tallies),
+    (4, "Abstimmungsrunden", _v4_rounds),
+    (5, "Wahlen und Archivierung", _v5_elections),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# === MIGRATIONS-LOGIK ===
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Gibt die aktuelle Schema-Version zurück (0 = leere Datenbank)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()
+    return row[0]
+
+
+def migrate(conn: sqlite3.Connection, target_version: Optional[int] = None) -> int:
+    """
+    Wendet alle ausstehenden Migrationen an (jede in einer eigenen Transaktion)
+    Returns: Schema-Version nach der Migration
+    """
+    if target_version is None:
+        target_version = LATEST_VERSION
+
+    current = get_schema_version(conn)
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current or version > target_version:
+            continue
+
+        # IMMEDIATE: ein zweiter Prozess wartet, statt dieselbe Migration parallel auszuführen
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= version:
+                # Bereits von einem anderen Prozess angewendet
+                conn.rollback()
+                current = version
+                continue
+            upgrade(conn.cursor())
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        print(f"Datenbank-Migration {version} angewendet: {description}")
+        current = version
+
+    return current
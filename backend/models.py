@@ -70,6 +70,25 @@ class ResultsSummary(BaseModel):
     """Zusammenfassung aller Ergebnisse"""
     results: list[VoteResult]
     total_votes: int
+    round_id: Optional[int] = None  # None = alle Runden
+
+
+class RoundInfo(BaseModel):
+    """Model für eine Abstimmungsrunde"""
+    round_id: int
+    started_at: str
+    vote_count: int
+    current: bool
+
+
+class ElectionInfo(BaseModel):
+    """Model für eine Wahl (laufend oder abgeschlossen)"""
+    election_id: int
+    started_at: str
+    ended_at: Optional[str] = None
+    vote_count: int
+    archived: bool
+    current: bool
 
 
 # === ADMIN ===
@@ -99,6 +118,21 @@ class ServerStatus(BaseModel):
 class VoteDetailExport(BaseModel):
     """Detaillierte Vote-Information für Export"""
     vote_id: int
+    round_id: int
     candidate_name: str
     client_id: str
     timestamp: str
+
+
+class ExportJob(BaseModel):
+    """Status eines Export-Jobs (queued, running, done, failed oder expired)"""
+    job_id: str
+    status: str
+    election_id: Optional[int] = None
+    data_version: str
+    filename: str
+    rows_written: int
+    total_rows: Optional[int] = None
+    created_at: str
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
@@ -0,0 +1,214 @@
+"""
+Profiling im laufenden Server (auch im PyInstaller-Build)
+- Anfragen-Profiler: cProfile für einen zufälligen Anteil der Anfragen,
+  aufsummiert zu einer .pstats-Datei
+- Prozess-Sampler: fragt für eine feste Dauer regelmäßig die Stacks aller
+  Threads ab und liefert sie im Collapsed-Stack-Format (für Flamegraphs)
+- Slow-Request-Log: Anfragen über einer Schwelle mit ihren teuersten
+  Datenbank-Methoden (über eine ContextVar, auch aus dem DB-Thread-Pool)
+"""
+
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+import cProfile
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+
+
+# Datenbank-Aufrufe der laufenden Anfrage: [(Methode, Modus, Wartezeit, Haltezeit)]
+_db_calls: ContextVar[Optional[list]] = ContextVar("db_calls", default=None)
+
+
+def record_db_call(method: str, mode: str, wait: float, hold: float):
+    """Wird vom Datenbank-Lock aufgerufen; merkt sich den Aufruf, falls die Anfrage verfolgt wird"""
+    calls = _db_calls.get()
+    if calls is not None:
+        calls.append((method, mode, wait, hold))
+
+
+class RequestProfiler:
+    """
+    cProfile für einen Anteil der Anfragen (immer nur eine gleichzeitig)
+    cProfile misst nur den Event-Loop-Thread; was dort während der Anfrage
+    für andere Tasks läuft, wird mitgezählt.
+    """
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.started_at: Optional[str] = None
+        self.profiled_requests = 0
+        self._profile: Optional[cProfile.Profile] = None
+        self._busy = False
+
+    @property
+    def active(self) -> bool:
+        return self.sample_rate > 0
+
+    def start(self, sample_rate: float):
+        """
+        Startet eine neue Aufzeichnung (verwirft die vorherige)
+        Eine gerade profilierte Anfrage beendet noch die alte Aufzeichnung, nicht die neue
+        """
+        self._profile = cProfile.Profile()
+        self.profiled_requests = 0
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.sample_rate = sample_rate
+
+    def stop(self):
+        """Beendet das Sampling; das Ergebnis bleibt abrufbar"""
+        self.sample_rate = 0.0
+
+    def should_profile(self) -> bool:
+        return self.sample_rate > 0 and not self._busy and random.random() < self.sample_rate
+
+    def enable(self) -> cProfile.Profile:
+        """Returns: die aktivierte Aufzeichnung; die Anfrage gibt sie an disable() zurück"""
+        self._busy = True
+        self.profiled_requests += 1
+        profile = self._profile
+        profile.enable()
+        return profile
+
+    def disable(self, profile: cProfile.Profile):
+        profile.disable()
+        self._busy = False
+
+    def dump(self) -> Optional[bytes]:
+        """Returns: Aufzeichnung im .pstats-Format (marshal, wie pstats.Stats.dump_stats)"""
+        if self._profile is None or self._busy:
+            return None
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+    def get_status(self) -> Dict:
+        return {
+            "active": self.active,
+            "sample_rate": self.sample_rate,
+            "started_at": self.started_at,
+            "profiled_requests": self.profiled_requests,
+        }
+
+
+class ProcessSampler:
+    """Sammelt für `duration` Sekunden alle `interval` Sekunden die Stacks aller Threads"""
+
+    def __init__(self):
+        self.duration = 0.0
+        self.interval = 0.0
+        self.samples = 0
+        self.started_at: Optional[str] = None
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, interval: float) -> bool:
+        """Startet den Sampler; Returns: False wenn bereits einer läuft"""
+        if self.running:
+            return False
+        self.duration = duration
+        self.interval = interval
+        self.samples = 0
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._stacks = Counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="profiling-sampler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Beendet den Sampler vorzeitig"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _sample(self):
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline and not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+    def dump(self) -> Optional[bytes]:
+        """Returns: Stacks im Collapsed-Format ("Thread;äußere;...;innere Funktion Anzahl")"""
+        if self.running or not self._stacks:
+            return None
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common()).encode()
+
+    def get_status(self) -> Dict:
+        return {
+            "running": self.running,
+            "duration_s": self.duration,
+            "interval_ms": self.interval * 1000,
+            "started_at": self.started_at,
+            "samples": self.samples,
+        }
+
+
+class SlowRequestLog:
+    """Merkt sich die letzten Anfragen über `threshold` Sekunden mit ihren Datenbank-Aufrufen"""
+
+    def __init__(self, max_entries: int = 100):
+        self.threshold = 0.0
+        self._entries: Deque[Dict] = deque(maxlen=max_entries)
+
+    @property
+    def active(self) -> bool:
+        return self.threshold > 0
+
+    def begin(self) -> object:
+        """Startet die Verfolgung der Datenbank-Aufrufe dieser Anfrage"""
+        return _db_calls.set([])
+
+    def end(self, token: object, method: str, path: str, status: int, duration: float):
+        """Beendet die Verfolgung und protokolliert die Anfrage, falls sie zu langsam war"""
+        calls = _db_calls.get()
+        _db_calls.reset(token)
+        if not self.active or duration < self.threshold:
+            return
+
+        # Pro Methode zusammenfassen, teuerste zuerst
+        summary: Dict[str, Dict] = {}
+        for name, mode, wait, hold in calls:
+            entry = summary.setdefault(name, {"method": name, "mode": mode, "calls": 0, "wait_ms": 0.0, "hold_ms": 0.0})
+            entry["calls"] += 1
+            entry["wait_ms"] += wait * 1000
+            entry["hold_ms"] += hold * 1000
+        top = sorted(summary.values(), key=lambda e: e["wait_ms"] + e["hold_ms"], reverse=True)[:5]
+
+        self._entries.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": duration * 1000,
+            "db_calls": top,
+        })
+        db_text = ", ".join(f"{e['method']} {e['wait_ms'] + e['hold_ms']:.1f} ms" for e in top) or "keine"
+        print(f"Langsame Anfrage: {method} {path} {duration * 1000:.0f} ms (DB: {db_text})")
+
+    def get_entries(self) -> List[Dict]:
+        return list(self._entries)
+
+    def get_status(self) -> Dict:
+        return {"active": self.active, "threshold_ms": self.threshold * 1000, "entries": len(self._entries)}
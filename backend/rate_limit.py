@@ -0,0 +1,65 @@
+"""
+Rate-Limiting pro Client (Token-Bucket)
+Jeder Client (IP-Adresse) hat einen Eimer mit höchstens `burst` Tokens, der
+sich mit `rate` Tokens pro Sekunde füllt; jede Anfrage kostet ein Token.
+Es werden höchstens `max_clients` Eimer gehalten, die am längsten nicht
+benutzten fallen zuerst heraus (ein vergessener Client startet mit vollem Eimer).
+Wird nur aus dem Event-Loop aufgerufen und braucht daher keinen Lock.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+import time
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        """
+        rate: nachgefüllte Tokens pro Sekunde
+        burst: maximale Anzahl Anfragen am Stück
+        max_clients: Obergrenze für gespeicherte Clients (LRU)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+
+        # Client -> (Tokens, Zeitpunkt der letzten Aktualisierung); Reihenfolge = zuletzt benutzt
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def acquire(self, client: str) -> float:
+        """
+        Verbraucht ein Token des Clients
+        Returns: 0.0 wenn die Anfrage erlaubt ist, sonst Sekunden bis zum nächsten Token
+        """
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+            self.allowed += 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+        return wait
+
+    def get_stats(self) -> Dict:
+        """Gibt Limits und Zähler zurück"""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
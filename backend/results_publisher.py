@@ -0,0 +1,184 @@
+"""
+Gebündelte Ergebnis-Updates für die WebSocket-Clients
+Jede Stimme markiert die Ergebnisse nur als geändert; gesendet wird höchstens
+ein Update pro Intervall (plus eine Zusammenfassung der Stimmen seit dem
+letzten Update als vote_cast). Die erste Stimme nach einer Pause geht sofort
+raus, der letzte Stand einer Stimmenwelle kommt immer an.
+
+Protokoll (jedes Update trägt eine fortlaufende Sequenznummer `seq`):
+- initial_data / results_update: vollständiger Stand {seq, results, total_votes}
+  (beim Verbinden, auf Anfrage "resync" und wenn sich die Kandidaten ändern)
+- results_delta: nur geänderte Stimmenzahlen {seq, counts: {candidate_id: Anzahl}, total_votes}
+- vote_cast: neue Stimmen seit dem letzten Update {counts: {candidate_id: Anzahl}, count}
+Ein Client, der eine Sequenznummer verpasst, schickt "resync" und erhält den vollständigen Stand.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional
+import asyncio
+import time
+
+
+class ResultsPublisher:
+    def __init__(self, async_db, ws_manager, interval: float = 0.25):
+        """
+        async_db: AsyncDatabase (liefert Ergebnisse und Gesamtstimmen)
+        ws_manager: WebSocketManager für die Broadcasts
+        interval: Mindestabstand (s) zwischen zwei Updates
+        """
+        self.async_db = async_db
+        self.ws_manager = ws_manager
+        self.interval = interval
+        self._pending_votes: Counter = Counter()
+        self._dirty = False
+        self._last_publish = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # Zuletzt veröffentlichter Stand; Grundlage für Deltas und Snapshots
+        self.seq = 0
+        self._results: Optional[List[dict]] = None
+        self._total_votes = 0
+        # Datenversion, aus der der veröffentlichte Stand gelesen wurde
+        self._version: Optional[str] = None
+        # Serialisiert Lesen + Vergleichen + Senden, damit kein älterer Stand einen neueren überholt
+        self._lock = asyncio.Lock()
+        self.publishes = 0
+        self.full_updates = 0
+        self.votes = 0
+
+    def vote_cast(self, candidate_id: int):
+        """Merkt eine angenommene Stimme für das nächste Update vor"""
+        self._pending_votes[candidate_id] += 1
+        self.votes += 1
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """Ergebnisse haben sich geändert; plant ein Update (läuft auf dem Event-Loop)"""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def discard_votes(self):
+        """Verwirft vorgemerkte Stimmen (z.B. beim Reset, damit keine alte Zusammenfassung nachkommt)"""
+        self._pending_votes.clear()
+
+    async def _run(self):
+        """Sendet Updates, solange Änderungen anstehen, mit mindestens `interval` Abstand"""
+        while self._dirty:
+            delay = self._last_publish + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self.publish()
+            except Exception as e:
+                print(f"Fehler beim Senden der Ergebnisse: {e}")
+
+    async def publish(self):
+        """Sendet sofort die vorgemerkten Stimmen und den aktuellen Stand (als Delta, wenn möglich)"""
+        async with self._lock:
+            # Vor dem Lesen zurücksetzen: Stimmen während des Lesens lösen ein weiteres Update aus
+            self._dirty = False
+            votes, self._pending_votes = self._pending_votes, Counter()
+            self._last_publish = time.monotonic()
+
+            version, results, total_votes = await self._read_state()
+            if votes:
+                # Nur IDs und Anzahl; die Namen kennen die Clients aus dem Snapshot
+                known = {r["candidate_id"] for r in results}
+                await self.ws_manager.broadcast_vote_cast(
+                    {candidate_id: count for candidate_id, count in votes.most_common() if candidate_id in known}
+                )
+
+            await self._publish_state(results, total_votes)
+            self._version = version
+
+    async def _read_state(self):
+        """Returns: (Datenversion, Ergebnisse, Gesamtstimmen); Version vor dem Lesen, die Daten sind höchstens neuer"""
+        version = await self.async_db.get_data_version()
+        results = await self.async_db.get_results()
+        total_votes = await self.async_db.get_total_votes()
+        return version, results, total_votes
+
+    async def _publish_state(self, results: List[dict], total_votes: int):
+        """Übernimmt einen neu gelesenen Stand und sendet ihn als Delta bzw. vollständig (nur unter _lock)"""
+        previous = self._results
+        if previous is not None and _candidates(previous) == _candidates(results):
+            old_counts = {r["candidate_id"]: r["vote_count"] for r in previous}
+            counts = {
+                r["candidate_id"]: r["vote_count"] for r in results
+                if r["vote_count"] != old_counts[r["candidate_id"]]
+            }
+            if not counts and total_votes == self._total_votes:
+                return
+            self._set_state(results, total_votes)
+            await self.ws_manager.broadcast_results_delta(counts, total_votes, self.seq)
+        else:
+            # Erster Stand oder Kandidaten geändert: vollständig senden
+            self._set_state(results, total_votes)
+            self.full_updates += 1
+            await self.ws_manager.broadcast_results(results, total_votes, self.seq)
+
+    def _set_state(self, results: List[dict], total_votes: int):
+        self.seq += 1
+        self.publishes += 1
+        self._results = results
+        self._total_votes = total_votes
+
+    async def snapshot(self) -> Dict:
+        """
+        Vollständiger aktueller Stand {seq, results, total_votes} (für neue Clients und Resync)
+        Normalerweise der veröffentlichte Stand, ohne Datenbankzugriff (viele Clients verbinden
+        sich nach einem Netzwerkausfall gleichzeitig neu). Nur wenn sich die Datenversion geändert
+        hat und kein Update ansteht (Änderungen am Publisher vorbei, z.B. aus der Admin-GUI), wird
+        neu gelesen und zuerst wie ein normales Update an alle Clients gesendet, damit die
+        Sequenznummern passen.
+        """
+        if await self._is_current():
+            return self._published()
+
+        async with self._lock:
+            # Ein anderer Client hat den Stand eventuell schon neu gelesen
+            if await self._is_current():
+                return self._published()
+            version, results, total_votes = await self._read_state()
+            if self._results is None:
+                self._results = results
+                self._total_votes = total_votes
+            else:
+                await self._publish_state(results, total_votes)
+            self._version = version
+            return self._published()
+
+    async def _is_current(self) -> bool:
+        """Veröffentlichter Stand noch gültig? Bei anstehendem Update kommt die Änderung als nächstes Delta"""
+        if self._results is None:
+            return False
+        return self._dirty or await self.async_db.get_data_version() == self._version
+
+    def _published(self) -> Dict:
+        return {"seq": self.seq, "results": self._results, "total_votes": self._total_votes}
+
+    async def close(self):
+        """Beendet den Update-Task (beim Herunterfahren sind die WebSocket-Clients bereits getrennt)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict:
+        """Statistiken für /api/metrics"""
+        return {
+            "interval_ms": self.interval * 1000,
+            "pending": self._dirty,
+            "seq": self.seq,
+            "publishes": self.publishes,
+            "full_updates": self.full_updates,
+            "votes": self.votes,
+            "avg_votes_per_publish": self.votes / self.publishes if self.publishes else 0.0,
+        }
+
+
+def _candidates(results: List[dict]) -> set:
+    """Kandidaten ohne Stimmenzahlen; ändern sie sich, reicht ein Delta nicht"""
+    return {(r["candidate_id"], r["candidate_name"], r["description"]) for r in results}
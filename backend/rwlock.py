@@ -0,0 +1,113 @@
+"""
+Reader-Writer-Lock für die Datenbank
+Beliebig viele Leser gleichzeitig, Schreiber exklusiv. Wartende Schreiber
+sperren neue Leser aus; nach jedem Schreiber kommen zuerst die bis dahin
+wartenden Leser dran, sodass keine Seite verhungert.
+Misst Warte- und Haltezeit pro Methode (als Histogramme, siehe metrics.py).
+"""
+
+from contextlib import contextmanager
+from typing import Dict
+import threading
+import time
+
+from metrics import FAST_BUCKETS, Histogram
+from profiling import record_db_call
+
+
+class ReadWriteLock:
+    def __init__(self):
+        """Initialisiert den Lock und die Contention-Metriken"""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        # Leser, die beim letzten Schreiber-Ende gewartet haben, sind vor dem nächsten Schreiber dran
+        self._write_releases = 0
+        self._admitted_readers = 0
+
+        # Metriken pro Methode; angemeldet werden sie von dem, der den Lock veröffentlicht
+        self.wait_seconds = Histogram(
+            "easywahl_db_lock_wait_seconds", "Wartezeit auf den Datenbank-Lock pro Methode",
+            labels=("method", "mode"), buckets=FAST_BUCKETS, register=False
+        )
+        self.hold_seconds = Histogram(
+            "easywahl_db_lock_hold_seconds", "Haltezeit des Datenbank-Locks pro Methode",
+            labels=("method", "mode"), buckets=FAST_BUCKETS, register=False
+        )
+
+    @contextmanager
+    def read(self, name: str = "read"):
+        """Gemeinsamer Lock für Lesezugriffe"""
+        start = time.perf_counter()
+        with self._cond:
+            arrived = self._write_releases
+            self._waiting_readers += 1
+            try:
+                while self._writer or (self._waiting_writers and arrived == self._write_releases):
+                    self._cond.wait()
+            finally:
+                self._waiting_readers -= 1
+            if arrived != self._write_releases and self._admitted_readers:
+                self._admitted_readers -= 1
+            self._readers += 1
+        acquired = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+            self._record(name, "read", acquired - start, time.perf_counter() - acquired)
+
+    @contextmanager
+    def write(self, name: str = "write"):
+        """Exklusiver Lock für Schreibzugriffe"""
+        start = time.perf_counter()
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers or self._admitted_readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        acquired = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._write_releases += 1
+                self._admitted_readers = self._waiting_readers
+                self._cond.notify_all()
+            self._record(name, "write", acquired - start, time.perf_counter() - acquired)
+
+    def _record(self, name: str, mode: str, wait: float, hold: float):
+        """Erfasst Warte- und Haltezeit eines Lock-Zugriffs"""
+        self.wait_seconds.labels(name, mode).observe(wait)
+        self.hold_seconds.labels(name, mode).observe(hold)
+        # Für das Slow-Request-Log der laufenden Anfrage
+        record_db_call(name, mode, wait, hold)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Gibt die Contention-Metriken pro Methode zurück (Zeiten in ms)"""
+        holds = {(labels["method"], labels["mode"]): child for labels, child in self.hold_seconds.children()}
+        stats = {}
+        for labels, child in self.wait_seconds.children():
+            _, calls, wait_total, wait_max = child.snapshot()
+            hold = holds.get((labels["method"], labels["mode"]))
+            hold_total = hold.snapshot()[2] if hold else 0.0
+            stats[labels["method"]] = {
+                "mode": labels["mode"],
+                "calls": calls,
+                "wait_ms_total": wait_total * 1000,
+                "wait_ms_avg": wait_total / calls * 1000 if calls else 0.0,
+                "wait_ms_max": wait_max * 1000,
+                "hold_ms_avg": hold_total / calls * 1000 if calls else 0.0
+            }
+        return stats
@@ -0,0 +1,140 @@
+"""
+Group-Commit-Writer für Stimmabgaben
+Sammelt eingehende Stimmen in einer Queue und schreibt sie in Micro-Batches
+(eine Transaktion pro Batch statt einer pro Stimme)
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+import queue
+import threading
+import time
+
+
+# Markiert das Ende der Queue beim Herunterfahren
+_STOP = object()
+
+
+class VoteWriter:
+    def __init__(
+        self,
+        write_batch: Callable[[List[Tuple[str, int]]], List[bool]],
+        max_batch_size: int = 64,
+        max_batch_delay: float = 0.002
+    ):
+        """
+        Startet den Writer-Thread
+
+        write_batch: schreibt alle Stimmen in einer Transaktion,
+                     gibt pro Stimme True (gezählt) oder False (abgelehnt) zurück
+        max_batch_size: maximale Anzahl Stimmen pro Commit
+        max_batch_delay: maximale Wartezeit (s) auf weitere Stimmen, bevor committet wird
+        """
+        self.write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+
+        # Metriken
+        self._batches = 0
+        self._votes = 0
+        self._last_batch_size = 0
+        self._max_batch_size_seen = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_commit_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="vote-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, client_id: str, candidate_id: int) -> Future:
+        """
+        Reiht eine Stimme ein
+        Returns: Future, das nach dem Commit des Batches True oder False liefert
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError("Vote-Writer wurde bereits gestoppt")
+            self._queue.put((client_id, candidate_id, future, time.perf_counter()))
+        return future
+
+    def stop(self):
+        """Schreibt alle noch wartenden Stimmen und beendet den Writer-Thread"""
+        with self._submit_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        """Writer-Schleife: sammelt Stimmen zu Batches und committet sie"""
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.perf_counter() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        item = self._queue.get(timeout=timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    running = False
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+    def _flush(self, batch: List[tuple]):
+        """Schreibt einen Batch und beantwortet die Futures der Aufrufer"""
+        started = time.perf_counter()
+        try:
+            results = self.write_batch([(client_id, candidate_id) for client_id, candidate_id, _, _ in batch])
+        except Exception as e:
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        for (_, _, future, _), success in zip(batch, results):
+            future.set_result(success)
+
+        waits = [finished - submitted for _, _, _, submitted in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._votes += len(batch)
+            self._last_batch_size = len(batch)
+            self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+            self._total_wait += sum(waits)
+            self._max_wait = max(self._max_wait, max(waits))
+            self._total_commit_time += finished - started
+
+    def get_stats(self) -> Dict:
+        """Gibt Metriken zu Batch-Größe und Wartezeit zurück"""
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_batch_delay_ms": self.max_batch_delay * 1000,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "votes": self._votes,
+                "last_batch_size": self._last_batch_size,
+                "largest_batch_size": self._max_batch_size_seen,
+                "avg_batch_size": self._votes / self._batches if self._batches else 0.0,
+                "avg_vote_delay_ms": self._total_wait / self._votes * 1000 if self._votes else 0.0,
+                "max_vote_delay_ms": self._max_wait * 1000,
+                "avg_commit_ms": self._total_commit_time / self._batches * 1000 if self._batches else 0.0
+            }
@@ -1,75 +1,204 @@
 """
 WebSocket-Manager für Live-Updates der Abstimmungsergebnisse
 Sendet automatisch Updates an alle verbundenen Clients
+Jede Verbindung hat eine begrenzte Warteschlange und einen eigenen Writer-Task:
+ein Broadcast reiht die Nachricht nur ein, ein langsamer Client hält niemanden
+auf. Läuft seine Warteschlange über, wird er getrennt und holt sich beim
+Wiederverbinden den aktuellen Stand (initial_data).
+Jede Nachricht wird pro Broadcast nur einmal zu JSON serialisiert; alle
+Writer senden denselben Text-Frame.
 """
 
 from fastapi import WebSocket
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 import json
 import asyncio
+import time
+
+from metrics import Gauge, Histogram
+
+
+WS_CONNECTIONS = Gauge("easywahl_ws_connections", "Aktive WebSocket-Verbindungen")
+BROADCAST_SECONDS = Histogram(
+    "easywahl_ws_broadcast_seconds", "Dauer eines Broadcasts (Einreihen bei allen Clients)", labels=("type",)
+)
+BROADCAST_RECIPIENTS = Histogram(
+    "easywahl_ws_broadcast_recipients", "Empfänger pro Broadcast",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+)
+QUEUE_SECONDS = Histogram(
+    "easywahl_ws_queue_seconds", "Zeit vom Einreihen bis die Nachricht an den Client gesendet ist"
+)
+
+# WebSocket-Close-Code "Try Again Later" für Clients, die nicht mehr mitkommen
+CLOSE_SLOW_CONSUMER = 1013
+
+
+class _Connection:
+    """Ausgehende Warteschlange und Writer-Task einer Verbindung"""
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        # Einträge: (serialisierter Frame, Zeitpunkt des Einreihens)
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.writer: Optional[asyncio.Task] = None
 
 
 class WebSocketManager:
-    def __init__(self):
-        """Initialisiert den WebSocket-Manager"""
-        self.active_connections: Set[WebSocket] = set()
-        self._lock = asyncio.Lock()
+    def __init__(self, max_queue: int = 1024, close_timeout: float = 1.0):
+        """
+        Initialisiert den WebSocket-Manager
+        max_queue: maximale Anzahl ausstehender Nachrichten pro Client
+        close_timeout: so lange (s) wird beim Trennen eines langsamen Clients auf das Close gewartet
+        """
+        self.active_connections: Dict[WebSocket, _Connection] = {}
+        self.max_queue = max_queue
+        self.close_timeout = close_timeout
+        self.dropped_slow = 0
+        self.send_errors = 0
+        # Laufende Close-Tasks (Referenz halten, damit sie nicht eingesammelt werden)
+        self._closing: Set[asyncio.Task] = set()
+        WS_CONNECTIONS.set_function(lambda: len(self.active_connections))
 
     async def connect(self, websocket: WebSocket):
-        """Nimmt eine neue WebSocket-Verbindung an"""
+        """Nimmt eine neue WebSocket-Verbindung an und startet ihren Writer-Task"""
         await websocket.accept()
-        async with self._lock:
-            self.active_connections.add(websocket)
+        connection = _Connection(websocket, self.max_queue)
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.active_connections[websocket] = connection
         print(f"Client verbunden. Aktive Verbindungen: {len(self.active_connections)}")
 
     async def disconnect(self, websocket: WebSocket):
         """Entfernt eine WebSocket-Verbindung"""
-        async with self._lock:
-            self.active_connections.discard(websocket)
-        print(f"Client getrennt. Aktive Verbindungen: {len(self.active_connections)}")
+        if self._remove(websocket):
+            print(f"Client getrennt. Aktive Verbindungen: {len(self.active_connections)}")
+
+    def _remove(self, websocket: WebSocket) -> bool:
+        """Entfernt die Verbindung und beendet ihren Writer; Returns: False wenn sie schon entfernt war"""
+        connection = self.active_connections.pop(websocket, None)
+        if connection is None:
+            return False
+        if connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+        return True
+
+    async def _write(self, connection: _Connection):
+        """Writer-Task: sendet die Nachrichten der Warteschlange der Reihe nach"""
+        websocket = connection.websocket
+        try:
+            while True:
+                frame, enqueued_at = await connection.queue.get()
+                await self._send_frame(websocket, frame)
+                QUEUE_SECONDS.observe(time.perf_counter() - enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Fehler beim Senden an Client: {e}")
+            self.send_errors += 1
+            self._remove(websocket)
+
+    @staticmethod
+    def encode(message: dict) -> str:
+        """Serialisiert eine Nachricht wie WebSocket.send_json (kompakt, UTF-8)"""
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    @staticmethod
+    async def _send_frame(websocket: WebSocket, frame: str):
+        await websocket.send_text(frame)
+
+    def send(self, websocket: WebSocket, message: dict) -> bool:
+        """
+        Reiht eine Nachricht für einen einzelnen Client ein (z.B. initial_data, pong)
+        Returns: False wenn der Client nicht (mehr) verbunden ist oder nicht mitkommt
+        """
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return False
+        try:
+            connection.queue.put_nowait((self.encode(message), time.perf_counter()))
+        except asyncio.QueueFull:
+            self._drop_slow([connection])
+            return False
+        return True
 
     async def broadcast(self, message: dict):
         """
-        Sendet eine Nachricht an alle verbundenen Clients
-        Entfernt automatisch disconnected Clients
+        Serialisiert die Nachricht einmal und reiht den Frame bei allen verbundenen Clients ein
+        Clients mit voller Warteschlange werden getrennt
         """
-        async with self._lock:
-            disconnected = set()
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Fehler beim Senden an Client: {e}")
-                    disconnected.add(connection)
+        start = time.perf_counter()
+        recipients = len(self.active_connections)
+        slow = []
+        item = (self.encode(message), start)
+        for connection in self.active_connections.values():
+            try:
+                connection.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                slow.append(connection)
+
+        if slow:
+            self._drop_slow(slow)
 
-            # Entferne disconnected clients
-            self.active_connections -= disconnected
+        BROADCAST_SECONDS.labels(message.get("type", "unknown")).observe(time.perf_counter() - start)
+        BROADCAST_RECIPIENTS.observe(recipients)
 
-            if disconnected:
-                print(f"{len(disconnected)} Clients entfernt. Aktive: {len(self.active_connections)}")
+    def _drop_slow(self, connections: List[_Connection]):
+        """Trennt Clients, deren Warteschlange übergelaufen ist; sie verbinden sich neu und erhalten den aktuellen Stand"""
+        for connection in connections:
+            self._remove(connection.websocket)
+            task = asyncio.create_task(self._close(connection.websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        self.dropped_slow += len(connections)
+        print(f"{len(connections)} langsame Clients getrennt. Aktive: {len(self.active_connections)}")
 
-    async def broadcast_results(self, results: List[dict], total_votes: int):
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=CLOSE_SLOW_CONSUMER, reason="Client zu langsam"), self.close_timeout
+            )
+        except Exception:
+            # Verbindung ist ohnehin hinüber
+            pass
+
+    async def broadcast_results(self, results: List[dict], total_votes: int, seq: int):
         """
-        Sendet Abstimmungsergebnisse an alle Clients
+        Sendet den vollständigen Stand der Abstimmungsergebnisse an alle Clients
         """
         message = {
             "type": "results_update",
             "data": {
+                "seq": seq,
                 "results": results,
                 "total_votes": total_votes
             }
         }
         await self.broadcast(message)
 
-    async def broadcast_vote_cast(self, candidate_id: int, candidate_name: str):
+    async def broadcast_results_delta(self, counts: Dict[int, int], total_votes: int, seq: int):
+        """
+        Sendet nur die geänderten Stimmenzahlen (candidate_id -> neue Anzahl) an alle Clients
+        """
+        message = {
+            "type": "results_delta",
+            "data": {
+                "seq": seq,
+                "counts": counts,
+                "total_votes": total_votes
+            }
+        }
+        await self.broadcast(message)
+
+    async def broadcast_vote_cast(self, counts: Dict[int, int]):
         """
-        Benachrichtigt alle Clients über eine neue Stimme
+        Benachrichtigt alle Clients über neue Stimmen seit dem letzten Update
+        counts: candidate_id -> Anzahl neuer Stimmen
         """
         message = {
             "type": "vote_cast",
             "data": {
-                "candidate_id": candidate_id,
-                "candidate_name": candidate_name
+                "counts": counts,
+                "count": sum(counts.values())
             }
         }
         await self.broadcast(message)
@@ -113,3 +242,13 @@ class WebSocketManager:
     def get_active_connections_count(self) -> int:
         """Gibt die Anzahl aktiver Verbindungen zurück"""
         return len(self.active_connections)
+
+    def get_stats(self) -> Dict:
+        """Statistiken für /api/metrics"""
+        return {
+            "connections": len(self.active_connections),
+            "queued_messages": sum(c.queue.qsize() for c in self.active_connections.values()),
+            "max_queue": self.max_queue,
+            "dropped_slow": self.dropped_slow,
+            "send_errors": self.send_errors,
+        }
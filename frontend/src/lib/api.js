@@ -14,24 +14,52 @@ const getHostname = () => {
 const API_BASE = `http://${getHostname()}:8000`;
 const WS_BASE = `ws://${getHostname()}:8000`;
 
+// Wie oft eine vom Server abgewiesene Anfrage (429/503 mit Retry-After) wiederholt wird
+const MAX_RETRIES = 3;
+
+/**
+ * Wartezeit laut Retry-After-Header in ms (null wenn nicht vorhanden)
+ * Zufälliger Aufschlag, damit nicht alle Clients gleichzeitig wiederkommen
+ */
+function getRetryDelay(response) {
+	const retryAfter = response.headers.get('Retry-After');
+	if ((response.status !== 429 && response.status !== 503) || retryAfter === null) {
+		return null;
+	}
+	const seconds = Number(retryAfter);
+	if (!Number.isFinite(seconds)) {
+		return null;
+	}
+	return seconds * 1000 * (1 + Math.random());
+}
+
 /**
  * Generischer Fetch-Wrapper mit Error-Handling
+ * Bei Überlast (429/503) wird nach Retry-After erneut versucht
  */
 async function apiRequest(endpoint, options = {}) {
 	try {
-		const response = await fetch(`${API_BASE}${endpoint}`, {
-			...options,
-			headers: {
-				'Content-Type': 'application/json',
-				...options.headers
+		for (let attempt = 0; ; attempt++) {
+			const response = await fetch(`${API_BASE}${endpoint}`, {
+				...options,
+				headers: {
+					'Content-Type': 'application/json',
+					...options.headers
+				}
+			});
+
+			const retryDelay = getRetryDelay(response);
+			if (retryDelay !== null && attempt < MAX_RETRIES) {
+				await new Promise((resolve) => setTimeout(resolve, retryDelay));
+				continue;
 			}
-		});
 
-		if (!response.ok) {
-			throw new Error(`API Error: ${response.status}`);
-		}
+			if (!response.ok) {
+				throw new Error(`API Error: ${response.status}`);
+			}
 
-		return await response.json();
+			return await response.json();
+		}
 	} catch (error) {
 		console.error('API Request failed:', error);
 		throw error;
@@ -131,12 +159,23 @@ function getBrowserFingerprint() {
 
 /**
  * WebSocket-Manager für Live-Updates
+ * Ergebnisse kommen als Snapshot (initial_data / results_update) und danach als
+ * Deltas (results_delta) mit fortlaufender Sequenznummer. Der Client führt den
+ * Stand selbst und meldet jedes Delta als vollständiges results_update weiter;
+ * vote_cast enthält nur Kandidaten-IDs, die Namen ergänzt der Client.
+ * Fehlt eine Sequenznummer, fordert er mit "resync" den vollständigen Stand an.
  */
 export class WebSocketClient {
 	constructor() {
 		this.ws = null;
 		this.reconnectInterval = 5000;
 		this.listeners = new Map();
+		// Aktueller Ergebnis-Stand (aus Snapshot + Deltas)
+		this.results = null;
+		this.resultsById = new Map();
+		this.totalVotes = 0;
+		this.resultsSeq = null;
+		this.resyncPending = false;
 	}
 
 	/**
@@ -168,6 +207,9 @@ export class WebSocketClient {
 			};
 
 			this.ws.onclose = () => {
+				// Nach dem Reconnect kommt ein neuer Snapshot (initial_data)
+				this.resultsSeq = null;
+				this.resyncPending = false;
 				console.log('WebSocket getrennt, reconnect in 5s...');
 				setTimeout(() => this.connect(), this.reconnectInterval);
 			};
@@ -181,7 +223,31 @@ export class WebSocketClient {
 	 * Verarbeitet eingehende WebSocket-Nachrichten
 	 */
 	handleMessage(message) {
-		const { type, data } = message;
+		let { type, data } = message;
+
+		if (type === 'initial_data' || type === 'results_update') {
+			this.setResults(data);
+		} else if (type === 'results_delta') {
+			data = this.applyDelta(data);
+			if (!data) {
+				return;
+			}
+			// Seiten erhalten wie bisher den vollständigen Stand
+			type = 'results_update';
+			message = { type, data };
+		} else if (type === 'vote_cast') {
+			// Namen zu den Kandidaten-IDs aus dem bekannten Stand ergänzen
+			const votes = Object.entries(data.counts).map(([candidateId, count]) => {
+				const result = this.resultsById.get(Number(candidateId));
+				return {
+					candidate_id: Number(candidateId),
+					candidate_name: result ? result.candidate_name : `#${candidateId}`,
+					count
+				};
+			});
+			data = { ...data, votes };
+			message = { type, data };
+		}
 
 		// Rufe registrierte Listener auf
 		if (this.listeners.has(type)) {
@@ -198,6 +264,70 @@ export class WebSocketClient {
 		}
 	}
 
+	/**
+	 * Übernimmt einen vollständigen Stand
+	 */
+	setResults(data) {
+		this.results = data.results.map((result) => ({ ...result }));
+		this.resultsById = new Map(this.results.map((result) => [result.candidate_id, result]));
+		this.totalVotes = data.total_votes;
+		this.resultsSeq = data.seq;
+		this.resyncPending = false;
+	}
+
+	/**
+	 * Wendet ein Delta auf den Stand an
+	 * @returns {object|null} Vollständiger Stand oder null, wenn das Delta nicht passt
+	 */
+	applyDelta(data) {
+		// Noch kein Snapshot oder Resync unterwegs: der nächste Snapshot bringt den Stand
+		if (this.resultsSeq === null || this.resyncPending) {
+			return null;
+		}
+		// Veraltet (bereits im Snapshot enthalten)
+		if (data.seq <= this.resultsSeq) {
+			return null;
+		}
+		// Lücke: vollständigen Stand anfordern
+		if (data.seq !== this.resultsSeq + 1) {
+			this.requestResync();
+			return null;
+		}
+
+		for (const [candidateId, count] of Object.entries(data.counts)) {
+			const result = this.resultsById.get(Number(candidateId));
+			if (!result) {
+				this.requestResync();
+				return null;
+			}
+			result.vote_count = count;
+		}
+		// Gleiche Reihenfolge wie der Server: meiste Stimmen zuerst, dann nach Name
+		this.results.sort(
+			(a, b) =>
+				b.vote_count - a.vote_count ||
+				(a.candidate_name < b.candidate_name ? -1 : a.candidate_name > b.candidate_name ? 1 : 0)
+		);
+		this.totalVotes = data.total_votes;
+		this.resultsSeq = data.seq;
+
+		return {
+			seq: this.resultsSeq,
+			results: this.results.map((result) => ({ ...result })),
+			total_votes: this.totalVotes
+		};
+	}
+
+	/**
+	 * Fordert den vollständigen Ergebnis-Stand an
+	 */
+	requestResync() {
+		if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+			this.resyncPending = true;
+			this.ws.send('resync');
+		}
+	}
+
 	/**
 	 * Registriert einen Listener für einen Message-Type
 	 * @param {string} type - Message-Type oder '*' für alle